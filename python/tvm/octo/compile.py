@@ -26,7 +26,7 @@ from tvm import relax
 from tvm.relax.frontend.onnx import from_onnx
 from tvm.relax.backend.contrib.cutlass import partition_for_cutlass
 from tvm.relax.transform.tuning_api import Trace
-from .utils import get_cuda_target, get_llvm_target
+from .utils import get_cuda_target, get_llvm_target, has_cuda
 from .octo_model import OctoModel
 from .schedule_cumsum import ScheduleCumsum
 from .inject_op_pattern import InjectOpPattern
@@ -163,7 +163,7 @@ def compile(
     # Determine current target.
     if target is None:
         # Check if this is gpu enabled.
-        if tvm.cuda(0).exist:
+        if has_cuda():
             target = get_cuda_target()
         else:
             target = get_llvm_target()
@@ -16,106 +16,361 @@
 # under the License.
 # pylint: disable=invalid-name, wrong-import-position
 """Utility functions for finding information about current device."""
+
+import concurrent.futures
+import functools
+import glob
+import hashlib
 import os
+import platform
 import re
 import sys
 import shutil
 import subprocess
-import psutil
+import warnings
 import tvm
 
+# Patterns used to parse the output of host tools. These are compiled once at
+# import time rather than on every query.
+_HOST_CPU_PATTERN = re.compile(r"Host CPU:\s*(\S+)")
+_REGISTERED_TARGETS_PATTERN = re.compile(r"Registered Targets:(.*)", re.DOTALL)
+# The output of lscpu produces a bunch of lines with the format
+# "Title: Value". This pattern matches both the title and value
+# parts of each line so that we can construct a dictionary.
+_LSCPU_LINE_PATTERN = re.compile(r"^([^:\n]+):[ \t]+(.*)$", re.MULTILINE)
+_PRODUCT_NAME_PATTERN = re.compile(r"Product Name\s+:\s+(.*)")
+# Fields of /proc/cpuinfo. Arm kernels report "Features" rather than "flags".
+_CPUINFO_FLAGS_PATTERN = re.compile(r"^(?:flags|Features)\s*:[ \t]*(.*)$", re.MULTILINE)
+_CPUINFO_CORES_PATTERN = re.compile(r"^cpu cores\s*:\s*(\d+)$", re.MULTILINE)
+_CPUINFO_PHYSICAL_ID_PATTERN = re.compile(r"^physical id\s*:\s*(\d+)$", re.MULTILINE)
+# Directory where linux lists the NUMA nodes of the host.
+_SYSFS_NODE_DIR = "/sys/devices/system/node"
+# Cpu flags that linux spells differently than llvm attributes. Flags are otherwise
+# matched exactly, so for example "sse3" never matches "ssse3".
+_LINUX_TO_LLVM_FEATURES = {
+    "pni": "sse3",
+    "pclmulqdq": "pclmul",
+    "sse4_1": "sse4.1",
+    "sse4_2": "sse4.2",
+    "lahf_lm": "sahf",
+    "abm": "lzcnt",
+    "bmi1": "bmi",
+    "rdrand": "rdrnd",
+    "sha_ni": "sha",
+    "avx_vnni": "avxvnni",
+    "avx512_bf16": "avx512bf16",
+    "avx512_bitalg": "avx512bitalg",
+    "avx512_fp16": "avx512fp16",
+    "avx512_vbmi2": "avx512vbmi2",
+    "avx512_vnni": "avx512vnni",
+    "avx512_vp2intersect": "avx512vp2intersect",
+    "avx512_vpopcntdq": "avx512vpopcntdq",
+    "amx_bf16": "amx-bf16",
+    "amx_int8": "amx-int8",
+    "amx_tile": "amx-tile",
+}
 
-def get_llvm_target() -> tvm.target.Target:
-    """Extract fully featured llvm target for current device.
+
+def _get_host_cpu_info():
+    """Collect the cpu flags, architecture, cores per socket and sockets of the host.
+
+    On Linux, /proc/cpuinfo is read directly when it provides everything we need, which
+    avoids spawning lscpu. Otherwise we fall back to parsing the output of lscpu. Other
+    platforms are supported when the optional py-cpuinfo package is installed.
+    """
+    if sys.platform not in ["linux", "linux2"]:
+        return _get_host_cpu_info_from_cpuinfo()
+
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            proc_info = f.read()
+    except OSError:
+        proc_info = ""
+
+    flags = _CPUINFO_FLAGS_PATTERN.search(proc_info)
+    cores = _CPUINFO_CORES_PATTERN.search(proc_info)
+    sockets = set(_CPUINFO_PHYSICAL_ID_PATTERN.findall(proc_info))
+    if flags and cores and sockets:
+        features = flags.group(1).lower().split()
+        return features, platform.machine().lower(), int(cores.group(1)), len(sockets)
+
+    output = subprocess.run(["lscpu"], capture_output=True, text=True, check=True).stdout
+    cpu_info = {key: value.lower().strip() for key, value in _LSCPU_LINE_PATTERN.findall(output)}
+
+    def _lscpu_count(*keys):
+        # ARM hosts report cores per cluster instead of per socket, and virtualised hosts
+        # may omit a count or print "-", in which case a single socket or core is assumed.
+        for key in keys:
+            if cpu_info.get(key, "").isdigit():
+                return int(cpu_info[key])
+        return 1
+
+    return (
+        cpu_info.get("Flags", "").split(),
+        cpu_info.get("Architecture", platform.machine().lower()),
+        _lscpu_count("Core(s) per socket", "Core(s) per cluster"),
+        _lscpu_count("Socket(s)"),
+    )
+
+
+def _get_host_cpu_info_from_cpuinfo():
+    """Collect host cpu information in process using the py-cpuinfo package."""
+    try:
+        import cpuinfo  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        raise ValueError(
+            f"Platform {sys.platform} is not supported. Consider installing py-cpuinfo."
+        )
+
+    import psutil  # pylint: disable=import-outside-toplevel
+
+    info = cpuinfo.get_cpu_info()
+    features = [flag.lower() for flag in info.get("flags", [])]
+    march = info.get("arch_string_raw", platform.machine()).lower()
+    cores = psutil.cpu_count(logical=False) or psutil.cpu_count()
+    return features, march, cores, 1
+
+
+def _get_num_cores(cores, sockets):
+    """Get the number of cores in the smallest memory domain the process can use.
+
+    TVM uses num-cores for cache blocking, and the last level cache is shared within a
+    socket or NUMA node rather than across the whole machine. Overestimating this
+    value is much worse than underestimating it.
+
+    Parameters
+    ----------
+    cores : int
+        The number of physical cores per socket.
+
+    sockets : int
+        The number of sockets.
 
     Returns
     -------
-    target : tvm.target.Target
-        A TVM target that fully describes the current devices CPU.
+    num_cores : int
+        The number of physical cores per NUMA node, bounded by the process affinity.
     """
-    # If we cant find llc, we wont be able to extract more information.
-    if shutil.which("llc") is None:
-        print(
-            "Could not find llc, falling back to default llvm. "
-            "Consider installing llc for better performance"
-        )
-        return "llvm"
+    num_nodes = 0
+    for cpulist in glob.glob(os.path.join(_SYSFS_NODE_DIR, "node[0-9]*", "cpulist")):
+        with open(cpulist, "r") as f:
+            # Skip memory only nodes.
+            if f.read().strip():
+                num_nodes += 1
+    num_cores = max(1, (cores * sockets) // max(num_nodes, sockets))
+    if hasattr(os, "sched_getaffinity"):
+        num_cores = min(num_cores, len(os.sched_getaffinity(0)))
+    return num_cores
+
+
+def _get_llvm_attrs(march, llc_info):
+    """Get the set of attributes llc supports for an architecture.
+
+    Querying llc for its attributes requires initializing a full target backend, which
+    is slow. Since the result only depends on the llc build and the architecture, it is
+    cached on disk and shared across processes.
+
+    Parameters
+    ----------
+    march : str
+        The llc architecture to query.
+
+    llc_info : str
+        The output of `llc --version`, used with the llc path to identify the llc build.
+
+    Returns
+    -------
+    attrs : FrozenSet[str]
+        The attributes llc supports for the architecture.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    cache_dir = os.path.join(cache_home, "tvm")
+    # Key on the llc binary as well as its version output, so upgrading or switching llvm
+    # never reuses attributes from a different build.
+    cache_key = hashlib.sha1(f"{_llc_path()}|{llc_info}|{march}".encode()).hexdigest()[:16]
+    cache_path = os.path.join(cache_dir, f"llvm_mattr_{march}_{cache_key}.txt")
+    if os.path.exists(cache_path):
+        with open(cache_path, "r") as f:
+            return frozenset(f.read().split())
+
+    # Get list of valid attributes for the target architecture. The features table
+    # is streamed line by line and we stop reading once it ends.
+    args = ["llc", f"-march={march}", "-mattr=help"]
+    attrs = set()
+    with subprocess.Popen(
+        args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    ) as proc:
+        in_features = False
+        for line in proc.stdout:
+            if line.startswith("Available features for this target:"):
+                in_features = True
+            elif line.startswith("Use +feature to enable a feature"):
+                break
+            elif in_features and line.strip():
+                attrs.add(line.split(maxsplit=1)[0])
+        proc.communicate()
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, args)
+
+    # An empty set means the features table was missing or cut off. Caching it would drop
+    # every feature on later runs, so only complete results are written.
+    if not attrs:
+        return frozenset()
+
+    # Write to a temporary file first so concurrent readers never see a partial cache.
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write("\n".join(sorted(attrs)))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+    return frozenset(attrs)
+
+
+@functools.lru_cache(maxsize=None)
+def _llc_path():
+    """Find the llc executable on the path, or None if it is not installed."""
+    return shutil.which("llc")
 
-    # Get host information from llc
-    cpu_info = subprocess.check_output("llc --version", shell=True).decode()
+
+@functools.lru_cache(maxsize=None)
+def _host_triple():
+    """Get the host target triple of the installed llvm."""
+    return subprocess.run(
+        ["llvm-config", "--host-target"], capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def _extract_llvm_target() -> tvm.target.Target:
+    """Query llc and the host cpu to build a fully featured llvm target."""
+    # The llc, llvm-config and host cpu queries are independent, so run them concurrently.
+    # Get host information from llc. The same output also lists the registered
+    # targets, so we only need to invoke it once.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+        llc_future = executor.submit(
+            subprocess.run, ["llc", "--version"], capture_output=True, text=True, check=True
+        )
+        triple_future = executor.submit(_host_triple)
+        cpu_info_future = executor.submit(_get_host_cpu_info)
+    llc_info = llc_future.result().stdout
 
     # Parse out cpu line
-    cpu = re.search("(?<=Host CPU: ).+", cpu_info).group(0)
+    cpu = _HOST_CPU_PATTERN.search(llc_info).group(1)
 
     # Next extract attribute string.
-    platform = sys.platform
-    # Linux
-    if platform not in ["linux", "linux2"]:
-        raise ValueError("Platform %s is not supported." % platform)
-    output = subprocess.check_output("lscpu", shell=True).decode()
-    # The output of lscpu produces a bunch of lines with the format
-    # "Title: Value". This pattern matches both the title and value
-    # parts of each line so that we can construct a dictionary.
-    pattern = r"^([^:]+):\s+(.*)$"
-    cpu_info = {}
-
-    for line in output.splitlines():
-        match = re.match(pattern, line)
-        if match:
-            key = match.group(1)
-            value = match.group(2)
-            cpu_info[key] = value.lower().strip()
-
-    features = cpu_info["Flags"].split(" ")
-    march = cpu_info["Architecture"]
-    cores = cpu_info["Core(s) per socket"]
-    sockets = cpu_info["Socket(s)"]
-    total_cores = str(int(cores) * int(sockets))
+    features, march, cores, sockets = cpu_info_future.result()
+    num_cores = _get_num_cores(cores, sockets)
     # Special case for x86_64 mismatch between underscore and hyphen
     if march == "x86_64":
         march = "x86-64"
 
     # Now we'll extract the architecture of the target.
-    output = subprocess.check_output("llc --version", shell=True).decode()
     # Remove header.
-    march_options = re.search("(?<=Registered Targets:).*", output, re.DOTALL).group(0)
-    march_list = [m.strip().split(" ")[0] for m in march_options.split("\n") if m]
-    valid_march = march in march_list
+    march_options = _REGISTERED_TARGETS_PATTERN.search(llc_info).group(1)
+    march_set = frozenset(m.split()[0] for m in march_options.split("\n") if m.strip())
+    valid_march = march in march_set
     # Build the base target.
-    host_target = (
-        subprocess.check_output("llvm-config --host-target", shell=True).decode().strip("\n")
-    )
-    target = f"llvm -mcpu={cpu} -mtriple={host_target} -num-cores={total_cores}"
+    target = f"llvm -mcpu={cpu} -mtriple={triple_future.result()} -num-cores={num_cores}"
 
     # If possible, add more attribute information.
     if not valid_march:
         return tvm.target.Target(target)
 
-    # Get list of valid attributes for the target architecture.
-    attrs_info = subprocess.check_output(
-        "llc -march=%s -mattr=help" % march, shell=True, stderr=subprocess.STDOUT
-    ).decode()
-    supported_attrs = re.search(
-        r"(?<=Available features for this target:).*(?=Use \+feature to enable a feature)",
-        attrs_info,
-        re.DOTALL,
-    ).group(0)
     # Find which features are supported attrs.
-    attrs_list = [attr.strip().split(" ")[0] for attr in supported_attrs.split("\n")]
-    attrs = [f for f in features if f in attrs_list]
+    supported_attrs = _get_llvm_attrs(march, llc_info)
+    attrs = [_LINUX_TO_LLVM_FEATURES.get(f, f) for f in features]
+    attrs = [a for a in attrs if a in supported_attrs]
 
-    # Compuse attributes into valid string.
+    # Compose attributes into valid string and, if there are any, add them to the
+    # llvm target. An empty -mattr= would otherwise be emitted.
     attrs_string = ",".join(f"+{a}" for a in attrs)
+    if attrs_string:
+        target = f"{target} -mattr={attrs_string}"
 
-    # Now we can add more information to the llvm target.
-    target = "%s -mattr=%s" % (target, attrs_string)
+    return tvm.target.Target(target)
+
+
+def _extract_llvm_target_in_process() -> tvm.target.Target:
+    """Build a fully featured llvm target from the llvm linked into TVM."""
+    codegen = tvm.target.codegen
+    cpu = codegen.llvm_get_system_cpu()
+    triple = codegen.llvm_get_system_triple()
+    target = f"llvm -mcpu={cpu} -mtriple={triple}"
+
+    # Count physical cores the same way as the llc path, so both report the same target.
+    # llvm itself does not report core counts, and the target is still usable without one.
+    try:
+        _, _, cores, sockets = _get_host_cpu_info()
+        target = f"{target} -num-cores={_get_num_cores(cores, sockets)}"
+    except (subprocess.CalledProcessError, OSError, ValueError) as err:
+        warnings.warn(f"Failed to query the host core count ({err}), omitting -num-cores.")
+
+    # Host features reported by llvm are already valid attributes.
+    attrs_string = ",".join(f"+{a}" for a in sorted(codegen.llvm_get_system_features()))
+    if attrs_string:
+        target = f"{target} -mattr={attrs_string}"
 
     return tvm.target.Target(target)
 
 
+def get_llvm_target() -> tvm.target.Target:
+    """Extract fully featured llvm target for current device.
+
+    If the TVM_LLVM_TARGET or TVM_TARGET environment variable is set, its value is
+    used as the target and no host information is queried. The variables are read
+    on every call, so changes made after the first call take effect.
+
+    Returns
+    -------
+    target : tvm.target.Target
+        A TVM target that fully describes the current devices CPU.
+    """
+    # Deployments that already know their target can skip host detection entirely.
+    env_target = os.environ.get("TVM_LLVM_TARGET") or os.environ.get("TVM_TARGET")
+    if env_target:
+        return tvm.target.Target(env_target)
+    return _detect_llvm_target()
+
+
+@functools.lru_cache(maxsize=None)
+def _detect_llvm_target() -> tvm.target.Target:
+    """Detect the llvm target of the host cpu.
+
+    The host cpu cannot change during the lifetime of a process, so the
+    result is computed once and cached for subsequent calls.
+    """
+    # Prefer querying the llvm linked into TVM, which needs no subprocesses.
+    if tvm.get_global_func("target.llvm_get_system_cpu", allow_missing=True):
+        try:
+            return _extract_llvm_target_in_process()
+        except tvm.TVMError as err:
+            warnings.warn(f"Failed to query the in-process llvm ({err}), falling back to llc.")
+
+    # If we cant find llc, we wont be able to extract more information.
+    if _llc_path() is None:
+        print(
+            "Could not find llc, falling back to default llvm. "
+            "Consider installing llc for better performance"
+        )
+        return tvm.target.Target("llvm")
+
+    try:
+        return _extract_llvm_target()
+    except (subprocess.CalledProcessError, FileNotFoundError) as err:
+        print(f"Failed to query llvm host information ({err}), falling back to default llvm.")
+        return tvm.target.Target("llvm")
+
+
+@functools.lru_cache(maxsize=None)
 def get_cuda_target() -> tvm.target.Target:
     """Extract the proper cuda target for the current device.
 
+    The detected gpu cannot change during the lifetime of a process, so the result is
+    cached after the first call.
+
     Returns
     -------
     target : tvm.target.Target
@@ -126,9 +381,10 @@ def get_cuda_target() -> tvm.target.Target:
         return tvm.target.Target("cuda")
 
     # Otherwise, query nvidia-smi to learn which gpu this is.
-    gpu_info = subprocess.check_output("nvidia-smi -q", shell=True).decode()
-    product_pattern = r"Product Name\s+:\s+(.*)"
-    product_name = re.search(product_pattern, gpu_info).group(1).strip("NVIDIA").strip()
+    gpu_info = subprocess.run(
+        ["nvidia-smi", "-q"], capture_output=True, text=True, check=True
+    ).stdout
+    product_name = _PRODUCT_NAME_PATTERN.search(gpu_info).group(1).strip("NVIDIA").strip()
 
     # TVM contains prebuilt targets for most GPUs, we need only create a mapping between the
     # official product name and the corresponding target.
@@ -154,9 +410,37 @@ def get_cuda_target() -> tvm.target.Target:
     return tvm.target.Target(target)
 
 
+@functools.lru_cache(maxsize=None)
+def has_cuda() -> bool:
+    """Check whether a cuda device is available on this machine.
+
+    Probing a device through TVM loads the cuda driver, which is slow and noisy on
+    machines without a gpu. We first check for the nvidia driver and only probe
+    when it is present.
+
+    Returns
+    -------
+    available : bool
+        True if a cuda device can be used.
+    """
+    if shutil.which("nvidia-smi") is None and not os.path.exists("/proc/driver/nvidia"):
+        return False
+    return tvm.cuda(0).exist
+
+
 def get_default_threads() -> int:
-    """Extract the number of threads supported on this device."""
+    """Extract the number of threads supported on this device.
+
+    The TVM_NUM_THREADS environment variable takes precedence. Otherwise the cpus
+    this process may run on are counted, which respects container cpu limits
+    set through the affinity mask.
+    """
     n = os.environ.get("TVM_NUM_THREADS")
     if n is not None:
         return int(n)
-    return psutil.cpu_count()
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+
+    import psutil  # pylint: disable=import-outside-toplevel
+
+    return psutil.cpu_count(logical=False) or psutil.cpu_count() or 1
@@ -67,6 +67,14 @@ def emit_te_with_span(bb, func: Callable, *args: Any, **kwargs: Any) -> relax.Va
     return bb.emit(call)
 
 
+def normalize_with_span(bb, op: relax.Call) -> relax.Expr:
+    """Same as block_builder.normalize, but attaches a span to the op first.
+    Uses the current span in the SpanContext.
+    """
+
+    return bb.normalize(attach_span(op))
+
+
 def attach_span(op: relax.Call):
     """Attach a span to a Relax op if it doesn't already have one.
     Uses the current span in the SpanContext.
@@ -80,9 +88,11 @@ def attach_span(op: relax.Call):
         The op with a span attached.
     """
     assert isinstance(op, relax.Call), "Expected a Call node but got: {op}".format(op=str(type(op)))
-    if op.span is None:
-        return relax.Call(op.op, op.args, op.attrs, op.sinfo_args, SpanContext.current())
-    return op
+    span = SpanContext.current()
+    # Rebuilding the call is only needed when there is a span to attach and the op has none.
+    if span is None or op.span is not None:
+        return op
+    return relax.Call(op.op, op.args, op.attrs, op.sinfo_args, span)
 
 
 class SpanContext:
@@ -34,8 +34,14 @@ If this fails, there may still be dynamic operations in the model.
 Not all TVM kernels currently support dynamic shapes, please file an issue on
 github.com/apache/tvm/issues if you hit an error with dynamic kernels.
 """
+import bisect
+import collections
+import concurrent.futures
+import functools
+import hashlib
+import os
 import warnings
-from typing import Union, Tuple, Optional, List, Dict, Any
+from typing import Union, Tuple, Optional, List, Dict, Any, Callable, Type
 
 import numpy as _np
 
@@ -44,10 +50,43 @@ from tvm import relax, topi
 from tvm.ir import IRModule
 from tvm.ir.supply import NameSupply
 from tvm.relax import testing
-from tvm.relax.frontend.common import attach_span, emit_te_with_span
+from tvm.relax.frontend.common import attach_span, emit_te_with_span, normalize_with_span
 
 import onnx.onnx_ml_pb2
 
+# Initializers smaller than this are decoded on the importing thread. Handing them to a
+# thread pool costs more than decoding them.
+_PARALLEL_DECODE_MIN_BYTES = 1 << 20
+
+
+@functools.lru_cache(maxsize=None)
+def _get_type_map() -> Dict[int, str]:
+    """Build the mapping from onnx integer datatypes to numpy datatype strings."""
+    try:
+        from onnx.mapping import TENSOR_TYPE_TO_NP_TYPE  # pylint: disable=import-outside-toplevel
+    except ImportError as exception:
+        raise ImportError("Unable to import onnx which is required {}".format(exception))
+
+    return {key: str(value) for key, value in TENSOR_TYPE_TO_NP_TYPE.items()}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_attr_field_map() -> Dict[int, Tuple[str, bool]]:
+    """Map each AttributeProto type to the field holding its value and whether it is repeated."""
+    attr_type = onnx.onnx_ml_pb2.AttributeProto
+    return {
+        attr_type.FLOAT: ("f", False),
+        attr_type.INT: ("i", False),
+        attr_type.STRING: ("s", False),
+        attr_type.TENSOR: ("t", False),
+        attr_type.GRAPH: ("g", False),
+        attr_type.FLOATS: ("floats", True),
+        attr_type.INTS: ("ints", True),
+        attr_type.STRINGS: ("strings", True),
+        attr_type.TENSORS: ("tensors", True),
+        attr_type.GRAPHS: ("graphs", True),
+    }
+
 
 def get_type(elem_type: Union[str, int]) -> str:
     """Converts onnx integer datatype to numpy datatype"""
@@ -56,15 +95,12 @@ def get_type(elem_type: Union[str, int]) -> str:
     if isinstance(elem_type, str):
         return elem_type
 
-    try:
-        from onnx.mapping import TENSOR_TYPE_TO_NP_TYPE  # pylint: disable=import-outside-toplevel
-    except ImportError as exception:
-        raise ImportError("Unable to import onnx which is required {}".format(exception))
-
-    return str(TENSOR_TYPE_TO_NP_TYPE[elem_type])
+    return _get_type_map()[elem_type]
 
 
-def get_info(info_proto: onnx.onnx_ml_pb2.ValueInfoProto) -> Tuple[str, List, str, List]:
+def get_info(
+    info_proto: onnx.onnx_ml_pb2.ValueInfoProto, dim_vars: Optional[Dict[str, tvm.tir.Var]] = None
+) -> Tuple[str, List, str, List]:
     """Extract the shape from a ValueInfoProto.
 
     Parameters
@@ -72,21 +108,32 @@ def get_info(info_proto: onnx.onnx_ml_pb2.ValueInfoProto) -> Tuple[str, List, st
     info_proto: onnx.onnx_ml_pb2.ValueInfoProto
         The ValueInfoProto to extract the info from.
 
+    dim_vars: Optional[Dict[str, tvm.tir.Var]]
+        A mapping from symbolic dimension names to the variables created for them.
+        Dimensions with the same name share a variable, and new ones are added to the map.
+
     Returns
     -------
     Tuple[str, List, str, List]
         The name, shape, type, and shape name of the ValueInfoProto.
     """
+    if dim_vars is None:
+        dim_vars = {}
     shape = []
     shape_name = []
     for dim in info_proto.type.tensor_type.shape.dim:
-        name = dim.dim_param
         value = dim.dim_value
-        if value is None or value == 0:
-            value = tvm.tir.Var("dyn", "int64")
-            shape_name.append(name)
-        else:
+        if value:
             shape_name.append(value)
+        else:
+            name = dim.dim_param
+            if not name:
+                value = tvm.tir.Var("dyn", "int64")
+            elif name in dim_vars:
+                value = dim_vars[name]
+            else:
+                value = dim_vars[name] = tvm.tir.Var("dyn", "int64")
+            shape_name.append(name)
         shape.append(value)
 
     name = info_proto.name
@@ -106,19 +153,136 @@ def get_numpy(tensor_proto: onnx.onnx_ml_pb2.TensorProto) -> _np.ndarray:
     return to_array(tensor_proto)
 
 
+# ONNX ops whose converters accept shape expressions as inputs. Any other op receiving one
+# is rejected during import.
+_SHAPE_COMPATIBLE_OPS = frozenset(["Reshape", "ConstantOfShape", "Gather", "Slice", "Expand"])
+
+
+def _hashable_attr(value: Any) -> Any:
+    """Convert a parsed attribute value into an equivalent hashable value.
+
+    Tensor and graph attributes are protobuf messages, which are not hashable, so they are
+    replaced by their serialized bytes.
+    """
+    if isinstance(value, tuple):
+        return tuple(_hashable_attr(v) for v in value)
+    if isinstance(value, (onnx.onnx_ml_pb2.TensorProto, onnx.onnx_ml_pb2.GraphProto)):
+        return value.SerializeToString()
+    return value
+
+
+def _memoize_per_graph(func: Callable) -> Callable:
+    """Memoize a single argument helper for the duration of one graph import.
+
+    The memo lives on the importer running the conversion and is cleared once it finishes,
+    so nodes of previously imported models are not kept alive. Outside of an import the
+    helper is evaluated directly.
+    """
+
+    @functools.wraps(func)
+    def _wrapper(arg):
+        importer = ONNXGraphImporter.current
+        if importer is None:
+            return func(arg)
+        key = (func, arg)
+        if key not in importer.memo:
+            importer.memo[key] = func(arg)
+        return importer.memo[key]
+
+    return _wrapper
+
+
+@_memoize_per_graph
+def _const_values(const: relax.Constant) -> Tuple:
+    """Decode the values of a constant, cached per constant node.
+
+    Scalar constants are decoded as a tuple holding their single value.
+    """
+    values = const.data.numpy()
+    if values.ndim == 0:
+        return (values.item(),)
+    return tuple(values.tolist())
+
+
+def _const_to_list(const: relax.Constant) -> List:
+    """Convert a 1-D constant into a list of Python scalars.
+
+    Constants shared between several nodes, such as shapes and axes, are only decoded once.
+    """
+    return list(_const_values(const))
+
+
+@_memoize_per_graph
+def _shape_values(shape: relax.ShapeExpr) -> Tuple[int, ...]:
+    """Decode the dimensions of a static shape, cached per shape node."""
+    return tuple(dim.value for dim in shape.values)
+
+
+def _get_static_shape(expr: relax.Expr) -> List[int]:
+    """Get the static shape of a tensor expression as a list of python ints.
+
+    Values flowing into several nodes share their shape, so it is only decoded once.
+    """
+    return list(_shape_values(expr.struct_info.shape))
+
+
+def _all_const(exprs: List[relax.Expr]) -> bool:
+    """Check whether every expression is a relax.Constant."""
+    return all(type(expr) is relax.Constant for expr in exprs)
+
+
+def _try_const_fold(inputs: List[relax.Expr], np_func: Callable, dtype: Optional[str] = None):
+    """Compute an operator directly with numpy if all of its inputs are constants.
+
+    Parameters
+    ----------
+    inputs : List[relax.Expr]
+        The inputs of the operator.
+    np_func : Callable
+        A numpy function implementing the operator.
+    dtype : Optional[str]
+        The dtype of the result. If not provided, the dtype numpy computes is used.
+
+    Returns
+    -------
+    output : Optional[relax.Constant]
+        The folded result, or None if any input is not a constant.
+    """
+    if not _all_const(inputs):
+        return None
+    output = np_func(*[inp.data.numpy() for inp in inputs])
+    return relax.const(output, output.dtype if dtype is None else dtype)
+
+
+def _scalar_const(value: Union[int, float], dtype: str) -> relax.Constant:
+    """Create a scalar constant, reusing the same node for repeated value and dtype pairs.
+
+    Like :py:func:`_memoize_per_graph`, constants are only reused within one graph import.
+    """
+    importer = ONNXGraphImporter.current
+    if importer is None:
+        return relax.const(value, dtype)
+    # Values that compare equal can still differ, such as -0.0 and 0.0, or 1 and True, so
+    # the memo is keyed on the repr and type of the value as well.
+    key = (_scalar_const, repr(value), type(value), dtype)
+    if key not in importer.memo:
+        importer.memo[key] = relax.const(value, dtype)
+    return importer.memo[key]
+
+
 class onnx_input(list):  # pylint: disable=invalid-name
     """A list that returns None when out-of-bounds indices are accessed."""
 
+    __slots__ = ()
+
     def __getitem__(self, item):
         if isinstance(item, slice):
-            if item.stop is None:
-                stop = len(self)
-            else:
-                stop = item.stop
-            indices = list(range(stop)[item])
+            if item.stop is None or item.stop <= len(self):
+                return super().__getitem__(item)
+            indices = list(range(item.stop)[item])
             return [self[i] for i in indices]
         if isinstance(item, int):
-            return list(self)[item] if item < len(self) else None
+            return super().__getitem__(item) if item < len(self) else None
         raise TypeError("list indices must be integers or slices, not %s" % type(item).__name__)
 
 
@@ -130,7 +294,20 @@ class OnnxOpConverter(object):
     of the op and the version is selected based on the opset version of the model.
     """
 
+    # Sorted list of the opset versions implemented by a converter.
+    _versions: List[int] = []
+    # Whether the op may produce different results for the same inputs, such as random ops.
+    # Repeated nodes running such an op are never merged during import.
+    nondeterministic: bool = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._versions = sorted(
+            int(d[len("_impl_v") :]) for d in dir(cls) if d.startswith("_impl_v")
+        )
+
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def get_converter(cls, opset):
         """Get converter matches given opset.
 
@@ -144,14 +321,13 @@ class OnnxOpConverter(object):
         converter, which should be `_impl_vx`. Number x is the biggest
             number smaller than or equal to opset belongs to all support versions.
         """
-        versions = [int(d.replace("_impl_v", "")) for d in dir(cls) if "_impl_v" in d]
-        versions = sorted(versions + [opset])
-        version = versions[max([i for i, v in enumerate(versions) if v == opset]) - 1]
-        if hasattr(cls, "_impl_v{}".format(version)):
-            return getattr(cls, "_impl_v{}".format(version))
-        raise NotImplementedError(
-            "opset version {} of {} not implemented".format(version, cls.__name__)
-        )
+        if not cls._versions:
+            raise NotImplementedError(
+                "opset version {} of {} not implemented".format(opset, cls.__name__)
+            )
+        # If opset is older than every implementation, the newest one is used.
+        version = cls._versions[bisect.bisect_right(cls._versions, opset) - 1]
+        return getattr(cls, "_impl_v{}".format(version))
 
 
 class MatMul(OnnxOpConverter):
@@ -167,9 +343,9 @@ class Div(OnnxOpConverter):
 
     @classmethod
     def _impl_v14(cls, bb, inputs, attr):
-        if all([isinstance(inp, relax.Constant) for inp in inputs]):
-            output = inputs[0].data.numpy() / inputs[1].data.numpy()
-            return relax.const(output, inputs[0].struct_info.dtype)
+        output = _try_const_fold(inputs, _np.divide, inputs[0].struct_info.dtype)
+        if output is not None:
+            return output
         return attach_span(relax.op.divide(inputs[0], inputs[1]))
 
 
@@ -196,9 +372,9 @@ class Transpose(OnnxOpConverter):
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
         axes = attr.get("perm", None)
-        if isinstance(inputs[0], relax.Constant):
-            output = _np.transpose(inputs[0].data.numpy(), axes)
-            return relax.const(output, output.dtype)
+        output = _try_const_fold(inputs, lambda data: _np.transpose(data, axes))
+        if output is not None:
+            return output
         return attach_span(relax.op.permute_dims(inputs[0], axes))
 
 
@@ -217,25 +393,19 @@ class Unsqueeze(OnnxOpConverter):
         axes = inputs[1]
 
         # If input is a constant, compute directly
-        if isinstance(data, relax.Constant) and isinstance(axes, relax.Constant):
-            axes = axes.data.numpy().tolist()
+        if _all_const([data, axes]):
             expanded = data.data.numpy()
-            if len(expanded.shape) == 0:
-                # Special case implying input is a scalar, wrap it as a list.
-                if 0 in axes:
-                    axes.remove(0)
-                expanded = [expanded]
-            for axis in axes:
-                expanded = _np.expand_dims(expanded, axis=axis)
-            return relax.const(expanded, data.struct_info.dtype)
+            # Axes refer to positions in the output, so insert the new unit dimensions
+            # in increasing order and reshape once.
+            out_ndim = expanded.ndim + axes.data.numpy().size
+            shape = list(expanded.shape)
+            for axis in sorted(int(axis) % out_ndim for axis in axes.data.numpy().flatten()):
+                shape.insert(axis, 1)
+            return relax.const(expanded.reshape(shape), data.struct_info.dtype)
 
         if isinstance(axes, relax.Constant):
-            constant_axes = list(axes.data.numpy())
-            constant_axes = list(map(int, constant_axes))
-            constant_axes = sorted(constant_axes)
-            for axis in constant_axes:
-                data = attach_span(relax.op.expand_dims(data, axis=axis))
-            return data
+            constant_axes = [int(axis) for axis in axes.data.numpy().flatten()]
+            return attach_span(relax.op.expand_dims(data, axis=constant_axes))
 
         raise NotImplementedError("Unsqueeze with dynamic axes is not supported.")
 
@@ -246,14 +416,15 @@ class Concat(OnnxOpConverter):
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
         axis = attr.get("axis", 0)
+        # Concatenating a single tensor is the identity.
+        if len(inputs) == 1:
+            return inputs[0]
         # If all inputs are constant, perform computation directly.
-        if all([isinstance(inp, relax.Constant) for inp in inputs]):
-            const_inputs = []
-            for inp in inputs:
-                const_inputs.append(inp.data.numpy())
-            out = _np.concatenate(const_inputs, axis=axis)
-            dtype = inputs[0].struct_info.dtype
-            return relax.const(out, dtype)
+        output = _try_const_fold(
+            inputs, lambda *args: _np.concatenate(args, axis=axis), inputs[0].struct_info.dtype
+        )
+        if output is not None:
+            return output
         return attach_span(relax.op.concat(inputs, axis=axis))
 
 
@@ -262,9 +433,9 @@ class Add(OnnxOpConverter):
 
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
-        if all([isinstance(inp, relax.Constant) for inp in inputs]):
-            output = inputs[0].data.numpy() + inputs[1].data.numpy()
-            return relax.const(output, output.dtype)
+        output = _try_const_fold(inputs, _np.add)
+        if output is not None:
+            return output
         return attach_span(relax.op.add(inputs[0], inputs[1]))
 
 
@@ -273,9 +444,9 @@ class Mul(OnnxOpConverter):
 
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
-        if all([isinstance(inp, relax.Constant) for inp in inputs]):
-            output = inputs[0].data.numpy() * inputs[1].data.numpy()
-            return relax.const(output, output.dtype)
+        output = _try_const_fold(inputs, _np.multiply)
+        if output is not None:
+            return output
         return attach_span(relax.op.multiply(inputs[0], inputs[1]))
 
 
@@ -285,9 +456,12 @@ class Cast(OnnxOpConverter):
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
         to_type = get_type(attr["to"])
-        if isinstance(inputs[0], relax.Constant):
-            output = inputs[0].data.numpy().astype(to_type)
-            return relax.const(output, to_type)
+        # Casting to the dtype the input already has is a no-op.
+        if getattr(inputs[0].struct_info, "dtype", None) == to_type:
+            return inputs[0]
+        output = _try_const_fold(inputs, lambda data: data.astype(to_type), to_type)
+        if output is not None:
+            return output
         return attach_span(relax.op.astype(inputs[0], to_type))
 
 
@@ -302,22 +476,18 @@ class Gather(OnnxOpConverter):
         axis = attr.get("axis", 0)
 
         # If all inputs are constant, we can compute directly.
-        if all([isinstance(inp, relax.Constant) for inp in [data, indices]]):
-            output = _np.take(data.data.numpy(), indices.data.numpy(), axis=axis)
-            return relax.const(output, output.dtype)
+        output = _try_const_fold([data, indices], lambda x, y: _np.take(x, y, axis=axis))
+        if output is not None:
+            return output
 
         # If input is a shape expression, take a value from that shape and return it as a constant.
         if isinstance(data, relax.ShapeExpr):
             assert isinstance(
                 indices, relax.Constant
             ), "Only constant indices supported for shape gather."
-            np_index = indices.data.numpy()
-            if len(np_index.shape) == 1:
-                np_index = np_index[0]
-            np_index = int(np_index)
-            shape_val = data[np_index]
+            shape_val = data.values[int(indices.data.numpy().item())]
             if hasattr(shape_val, "value"):
-                return relax.const(shape_val.value, dtype="int64")
+                return _scalar_const(shape_val.value, "int64")
             else:
                 raise ValueError("Need to fix this case.")
 
@@ -328,6 +498,23 @@ class Gather(OnnxOpConverter):
 class Gemm(OnnxOpConverter):
     """Convert an onnx Gemm node into an equivalent Relax expression."""
 
+    @classmethod
+    def _scale(cls, data, factor, dtype):
+        # Scaling by one is a no-op, and scaling a constant can be done at import time.
+        if factor is None or factor == 1.0:
+            return data
+        output = _try_const_fold([data], lambda x: x * factor, dtype)
+        if output is not None:
+            return output
+        return attach_span(relax.op.multiply(data, _scalar_const(factor, dtype)))
+
+    @classmethod
+    def _transpose(cls, data):
+        output = _try_const_fold([data], _np.transpose)
+        if output is not None:
+            return output
+        return attach_span(relax.op.permute_dims(data, [1, 0]))
+
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
         alpha = attr.get("alpha", None)
@@ -341,18 +528,16 @@ class Gemm(OnnxOpConverter):
 
         # Compute Y = alpha * A X B + beta * C
 
-        if alpha is not None:
-            A = bb.normalize(attach_span(relax.op.multiply(A, relax.const(alpha, dtype=dtype))))
+        A = cls._scale(A, alpha, dtype)
 
         if transA:
-            A = attach_span(relax.op.permute_dims(A, [1, 0]))
+            A = cls._transpose(A)
         if transB:
-            B = attach_span(relax.op.permute_dims(B, [1, 0]))
-        Y = bb.normalize(attach_span(relax.op.matmul(A, B)))
+            B = cls._transpose(B)
+        Y = attach_span(relax.op.matmul(A, B))
 
         if C is not None:
-            if beta is not None:
-                C = bb.normalize(attach_span(relax.op.multiply(C, relax.const(beta, dtype=dtype))))
+            C = cls._scale(C, beta, dtype)
             Y = attach_span(relax.op.add(Y, C))
 
         return Y
@@ -365,11 +550,11 @@ class Reshape(OnnxOpConverter):
     def _impl_v13(cls, bb, inputs, attr):
         data = inputs[0]
         new_shape = inputs[1]
-        if isinstance(data, relax.Constant) and isinstance(new_shape, relax.Constant):
-            out = _np.reshape(data.data.numpy(), new_shape.data.numpy().tolist())
+        if _all_const([data, new_shape]):
+            out = _np.reshape(data.data.numpy(), _const_to_list(new_shape))
             return relax.const(out, out.dtype)
         if isinstance(inputs[1], relax.Constant):
-            new_shape = inputs[1].data.numpy().tolist()
+            new_shape = _const_to_list(inputs[1])
         out = relax.op.reshape(data, new_shape)
         return attach_span(out)
 
@@ -393,8 +578,9 @@ class BiasGelu(OnnxOpConverter):
 
     @classmethod
     def _impl_v1(cls, bb, inputs, attr):
+        # The add feeds the gelu directly, so FuseOps merges the pair into a single kernel.
         inp = attach_span(relax.op.add(inputs[0], inputs[1]))
-        return attach_span(relax.op.nn.gelu(inp))
+        return Gelu._impl_v1(bb, [inp], attr)
 
 
 class Where(OnnxOpConverter):
@@ -402,22 +588,28 @@ class Where(OnnxOpConverter):
 
     @classmethod
     def _impl_v16(cls, bb, inputs, attr):
-        if all([isinstance(inp, relax.Constant) for inp in inputs]):
-            np_inputs = [inp.data.numpy() for inp in inputs]
-            output = _np.where(*np_inputs)
-            return relax.const(output, output.dtype)
+        output = _try_const_fold(inputs, _np.where)
+        if output is not None:
+            return output
         return attach_span(relax.op.where(inputs[0], inputs[1], inputs[2]))
 
 
 class Clip(OnnxOpConverter):
     """Converts an onnx Clip node into an equivalent Relax expression."""
 
+    @classmethod
+    def _is_unbounded(cls, bound, inf):
+        # A missing bound, or a constant bound at the given infinity, does not clip anything.
+        if bound is None:
+            return True
+        return type(bound) is relax.Constant and bool(_np.all(bound.data.numpy() == inf))
+
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
         results = inputs[0]
-        if inputs[1] is not None:
+        if not cls._is_unbounded(inputs[1], -_np.inf):
             results = emit_te_with_span(bb, topi.maximum, results, inputs[1])
-        if inputs[2] is not None:
+        if not cls._is_unbounded(inputs[2], _np.inf):
             results = emit_te_with_span(bb, topi.minimum, results, inputs[2])
         return results
 
@@ -427,9 +619,9 @@ class Equal(OnnxOpConverter):
 
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
-        if all([isinstance(inp, relax.Constant) for inp in inputs]):
-            output = inputs[0].data.numpy() == inputs[1].data.numpy()
-            return relax.const(output, output.dtype)
+        output = _try_const_fold(inputs, _np.equal)
+        if output is not None:
+            return output
         return attach_span(relax.op.equal(inputs[0], inputs[1]))
 
 
@@ -469,6 +661,9 @@ class Sqrt(OnnxOpConverter):
 
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
+        output = _try_const_fold(inputs, _np.sqrt, inputs[0].struct_info.dtype)
+        if output is not None:
+            return output
         return attach_span(relax.op.sqrt(inputs[0]))
 
 
@@ -511,34 +706,27 @@ class Conv(OnnxOpConverter):
                 "OIHW",
             )
         elif ndim == 4:
-            conv_out = bb.normalize(
-                attach_span(
-                    relax.op.nn.conv2d(
-                        data=inputs[0],
-                        weight=inputs[1],
-                        strides=attr.get("strides", 1),
-                        padding=attr.get("pads", 0),
-                        dilation=attr.get("dilation", 1),
-                        groups=attr.get("group", 1),
-                        data_layout="NCHW",
-                        kernel_layout="OIHW",
-                    )
-                )
+            conv_out = attach_span(
+                relax.op.nn.conv2d(
+                    data=inputs[0],
+                    weight=inputs[1],
+                    strides=attr.get("strides", 1),
+                    padding=attr.get("pads", 0),
+                    dilation=attr.get("dilation", 1),
+                    groups=attr.get("group", 1),
+                    data_layout="NCHW",
+                    kernel_layout="OIHW",
+                ),
             )
         else:
             raise NotImplementedError("Only 2d conv currently supported.")
 
         if inputs[2] is not None:
-            bias = attach_span(
-                relax.op.reshape(
-                    inputs[2],
-                    [1, -1]
-                    + [
-                        1,
-                    ]
-                    * (ndim - 2),
-                )
-            )
+            bias_shape = [1, -1] + [1] * (ndim - 2)
+            # Reshape a constant bias at import time so only the add remains in the graph.
+            bias = _try_const_fold([inputs[2]], lambda x: _np.reshape(x, bias_shape))
+            if bias is None:
+                bias = attach_span(relax.op.reshape(inputs[2], bias_shape))
             conv_out = attach_span(relax.op.add(conv_out, bias))
 
         return conv_out
@@ -549,20 +737,7 @@ class Erf(OnnxOpConverter):
 
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
-        x = inputs[0]
-        sqrt2 = relax.const(_np.sqrt(2), x.struct_info.dtype)
-        # TODO: replace with erf operator once it is implemented
-        mul = attach_span(relax.op.multiply(x, sqrt2))
-        gelu = attach_span(relax.op.nn.gelu(mul))
-        mul_2 = attach_span(relax.op.multiply(gelu, sqrt2))
-        return bb.normalize(
-            attach_span(
-                relax.op.add(
-                    attach_span(relax.op.divide(mul_2, x)),
-                    relax.const(-1, x.struct_info.dtype),
-                )
-            )
-        )
+        return emit_te_with_span(bb, topi.erf, inputs[0])
 
 
 class CumSum(OnnxOpConverter):
@@ -590,10 +765,17 @@ class Squeeze(OnnxOpConverter):
         axis = inputs[1]
         if axis is not None:
             axis = [int(x) for x in inputs[1].data.numpy()]
+            # Squeezing an empty list of axes is the identity.
+            if not axis:
+                return inputs[0]
         # If data is constant, perform computation directly.
-        if isinstance(inputs[0], relax.Constant):
-            out_data = _np.squeeze(inputs[0].data.numpy(), axis)
-            return relax.const(out_data, inputs[0].struct_info.dtype)
+        output = _try_const_fold(
+            [inputs[0]],
+            lambda data: _np.squeeze(data, None if axis is None else tuple(axis)),
+            inputs[0].struct_info.dtype,
+        )
+        if output is not None:
+            return output
         return attach_span(relax.op.squeeze(inputs[0], axis))
 
 
@@ -620,6 +802,10 @@ class Constant(OnnxOpConverter):
 class ConstantOfShape(OnnxOpConverter):
     """Converts an onnx ConstantOfShape node into an equivalent Relax expression."""
 
+    # Outputs with more elements than this are filled at runtime instead of being
+    # embedded in the module as constants.
+    _max_const_elems = 1 << 20
+
     @classmethod
     def _impl_v9(cls, bb, inputs, attr):
         shape = inputs[0]
@@ -629,13 +815,16 @@ class ConstantOfShape(OnnxOpConverter):
         else:
             dtype = "float32"
 
-        # If shape is a constant, we can directly create a relax constant.
+        # If shape is static and small, we can directly create a relax constant.
         if isinstance(shape, relax.Constant):
-            np_array = _np.zeros(shape=shape.data.numpy()) + value
-            return relax.const(np_array, dtype=dtype)
-        elif isinstance(shape, relax.ShapeExpr):
-            np_array = _np.zeros(shape=[dim.value for dim in shape]) + value
-            return relax.const(np_array, dtype)
+            shape = relax.ShapeExpr(_const_to_list(shape))
+        if isinstance(shape, relax.ShapeExpr) and all(
+            isinstance(dim, tvm.tir.IntImm) for dim in shape.values
+        ):
+            static_shape = [dim.value for dim in shape.values]
+            if functools.reduce(lambda x, y: x * y, static_shape, 1) <= cls._max_const_elems:
+                np_array = _np.full(static_shape, _np.asarray(value).item(), dtype=dtype)
+                return relax.const(np_array, dtype)
 
         # Otherwise we have to use the value of shape at runtime.
         # Create a constant for the new value.
@@ -643,7 +832,7 @@ class ConstantOfShape(OnnxOpConverter):
 
         # Convert to shape expression if needed.
         if not isinstance(shape.struct_info, relax.ShapeStructInfo):
-            shape_ndim = [dim.value for dim in shape.struct_info.shape.values][0]
+            shape_ndim = _get_static_shape(shape)[0]
             # Broadcast the constant to the input shape.
             shape_dataflow_var = bb.emit(
                 relax.Call(
@@ -666,9 +855,9 @@ class Sub(OnnxOpConverter):
 
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
-        if all([isinstance(inp, relax.Constant) for inp in inputs]):
-            output = inputs[0].data.numpy() - inputs[1].data.numpy()
-            return relax.const(output, output.dtype)
+        output = _try_const_fold(inputs, _np.subtract)
+        if output is not None:
+            return output
         return attach_span(relax.op.subtract(inputs[0], inputs[1]))
 
 
@@ -693,9 +882,9 @@ class Neg(OnnxOpConverter):
 
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
-        if isinstance(inputs[0], relax.Constant):
-            data_np = inputs[0].data.numpy()
-            return relax.const(_np.negative(data_np), inputs[0].struct_info.dtype)
+        output = _try_const_fold(inputs, _np.negative, inputs[0].struct_info.dtype)
+        if output is not None:
+            return output
         return attach_span(relax.op.negative(inputs[0]))
 
 
@@ -704,9 +893,9 @@ class Abs(OnnxOpConverter):
 
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
-        if isinstance(inputs[0], relax.Constant):
-            output = _np.abs(inputs[0].data.numpy())
-            return relax.const(output, output.dtype)
+        output = _try_const_fold(inputs, _np.abs)
+        if output is not None:
+            return output
         return attach_span(relax.op.abs(inputs[0]))
 
 
@@ -715,15 +904,12 @@ class Min(OnnxOpConverter):
 
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
-        if all([isinstance(inp, relax.Constant) for inp in inputs]):
-            np_inputs = [inp.data.numpy() for inp in inputs]
-            output = _np.minimum(*np_inputs)
-            return relax.const(output, output.dtype)
+        output = _try_const_fold(inputs, lambda *args: functools.reduce(_np.minimum, args))
+        if output is not None:
+            return output
 
-        # Expand inputs, stack them, then perform minimum over the new axis.
-        inputs = [bb.normalize(attach_span(relax.op.expand_dims(i, axis=0))) for i in inputs]
-        stacked_tensor = attach_span(relax.op.concat(inputs, axis=0))
-        return attach_span(relax.op.min(stacked_tensor, axis=0))
+        # Reduce the inputs pairwise so no stacked intermediate tensor is materialized.
+        return functools.reduce(lambda x, y: attach_span(relax.op.minimum(x, y)), inputs)
 
 
 class Max(OnnxOpConverter):
@@ -731,15 +917,12 @@ class Max(OnnxOpConverter):
 
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
-        if all([isinstance(inp, relax.Constant) for inp in inputs]):
-            np_inputs = [inp.data.numpy() for inp in inputs]
-            output = _np.maximum(*np_inputs)
-            return relax.const(output, output.dtype)
+        output = _try_const_fold(inputs, lambda *args: functools.reduce(_np.maximum, args))
+        if output is not None:
+            return output
 
-        # Expand inputs, stack them, then perform maximum over the new axis.
-        inputs = [bb.normalize(attach_span(relax.op.expand_dims(i, axis=0))) for i in inputs]
-        stacked_tensor = attach_span(relax.op.concat(inputs, axis=0))
-        return attach_span(relax.op.max(stacked_tensor, axis=0))
+        # Reduce the inputs pairwise so no stacked intermediate tensor is materialized.
+        return functools.reduce(lambda x, y: attach_span(relax.op.maximum(x, y)), inputs)
 
 
 class Log(OnnxOpConverter):
@@ -747,8 +930,9 @@ class Log(OnnxOpConverter):
 
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
-        if isinstance(inputs[0], relax.Constant):
-            return relax.const(_np.log(inputs[0].data.numpy()), inputs[0].struct_info.dtype)
+        output = _try_const_fold(inputs, _np.log, inputs[0].struct_info.dtype)
+        if output is not None:
+            return output
         return attach_span(relax.op.log(inputs[0]))
 
 
@@ -783,9 +967,9 @@ class Less(OnnxOpConverter):
 
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
-        if all([isinstance(inp, relax.Constant) for inp in inputs]):
-            output = _np.less(inputs[0].data.numpy(), inputs[1].data.numpy())
-            return relax.const(output, output.dtype)
+        output = _try_const_fold(inputs, _np.less)
+        if output is not None:
+            return output
         return attach_span(relax.op.less(inputs[0], inputs[1]))
 
 
@@ -794,9 +978,9 @@ class LessOrEqual(OnnxOpConverter):
 
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
-        if all([isinstance(inp, relax.Constant) for inp in inputs]):
-            output = _np.less_equal(inputs[0].data.numpy(), inputs[1].data.numpy())
-            return relax.const(output, output.dtype)
+        output = _try_const_fold(inputs, _np.less_equal)
+        if output is not None:
+            return output
         return attach_span(relax.op.less_equal(inputs[0], inputs[1]))
 
 
@@ -850,35 +1034,28 @@ class Slice(OnnxOpConverter):
         ends = inputs[2]
         axes = inputs[3]
         steps = inputs[4]
-        if not all(
-            [
-                (isinstance(param, relax.Constant) or param is None)
-                for param in [starts, ends, axes, steps]
-            ]
-        ):
+        if not _all_const([param for param in [starts, ends, axes, steps] if param is not None]):
             raise ValueError("Only constant Slice parameters are currently supported.")
         # Convert parameters to constant lists.
-        starts = starts.data.numpy().tolist()
-        ends = ends.data.numpy().tolist()
+        starts = _const_to_list(starts)
+        ends = _const_to_list(ends)
         if axes is not None:
-            axes = axes.data.numpy().tolist()
+            axes = _const_to_list(axes)
         else:
             axes = list(range(len(starts)))
         # Convert negative axis to positive if needed.
-        for i, axis in enumerate(axes):
-            if axis < 0:
-                axes[i] = axis + len(data.struct_info.shape)
+        ndim = len(data.struct_info.shape)
+        axes = [axis + ndim if axis < 0 else axis for axis in axes]
         if steps is not None:
-            steps = steps.data.numpy().tolist()
+            steps = _const_to_list(steps)
         else:
             steps = [1] * len(axes)
         # If input is a shape tensor, we can directly extract it.
         if isinstance(data, relax.ShapeExpr):
-            shape_data = [dim.value for dim in data]
             # Starts, ends, and steps must be 1-d for shape operation.
             assert all(len(i) == 1 for i in [starts, ends, steps])
-            sliced_values = shape_data[starts[0] : ends[0] : steps[0]]
-            return relax.const(sliced_values, "int64")
+            sliced_values = _shape_values(data)[starts[0] : ends[0] : steps[0]]
+            return relax.const(list(sliced_values), "int64")
         return attach_span(relax.op.strided_slice(data, axes, starts, ends, steps))
 
 
@@ -894,9 +1071,9 @@ class Pad(OnnxOpConverter):
             constant_value = 0.0
 
         if isinstance(pads, relax.Constant):
-            pad_before, pad_after = _np.split(pads.data.numpy(), 2)
-            pad_before = _np.ndarray.tolist(pad_before)
-            pad_after = _np.ndarray.tolist(pad_after)
+            pads = _const_values(pads)
+            half = len(pads) // 2
+            pad_before, pad_after = list(pads[:half]), list(pads[half:])
         else:
             raise ValueError("Dynamic pads are not supported yet.")
 
@@ -926,7 +1103,7 @@ class Tile(OnnxOpConverter):
     def _impl_v13(cls, bb, inputs, attr):
         reps = inputs[1]
         if isinstance(reps, relax.Constant):
-            reps = reps.data.numpy().tolist()
+            reps = _const_to_list(reps)
         else:
             raise ValueError("Dynamic reps for Tile are supported yet.")
         return emit_te_with_span(bb, topi.tile, inputs[0], reps)
@@ -941,24 +1118,28 @@ class Expand(OnnxOpConverter):
         shape = inputs[1]
 
         if isinstance(shape, relax.ShapeExpr):
-            return relax.op.broadcast_to(data, shape)
+            return attach_span(relax.op.broadcast_to(data, shape))
 
         # If possible, directly expand to constant shape.
         if isinstance(shape, relax.Constant):
-            new_shape = shape.data.numpy().tolist()
-            # For some reason, onnx allows target shapes to be smaller than input shapes.
-            # We need to go correct it.
-            data_shape = [dim.value for dim in data.struct_info.shape]
-            for i, s in enumerate(new_shape):
-                if s < data_shape[i]:
-                    new_shape[i] = data_shape[i]
+            new_shape = _const_to_list(shape)
+            data_shape = _get_static_shape(data)
             # If the new shape matches the input shape, no transformation is needed.
             if new_shape == data_shape:
                 return data
-            return relax.op.broadcast_to(data, relax.ShapeExpr(new_shape))
+            # For some reason, onnx allows target shapes to be smaller than input shapes.
+            # Expand broadcasts the two shapes, so align them from the right and keep the
+            # larger of each pair of dimensions.
+            ndim = max(len(new_shape), len(data_shape))
+            new_shape = [1] * (ndim - len(new_shape)) + new_shape
+            padded_data_shape = [1] * (ndim - len(data_shape)) + data_shape
+            new_shape = [max(s, d) for s, d in zip(new_shape, padded_data_shape)]
+            if new_shape == data_shape:
+                return data
+            return attach_span(relax.op.broadcast_to(data, relax.ShapeExpr(new_shape)))
 
         # Otherwise handle dynamic shapes.
-        shape_ndim = [dim.value for dim in shape.struct_info.shape.values][0]
+        shape_ndim = _get_static_shape(shape)[0]
         shape_dataflow_var = bb.emit(
             relax.Call(
                 relax.ExternFunc("vm.builtin.tensor_to_shape"),
@@ -971,7 +1152,7 @@ class Expand(OnnxOpConverter):
         for i in range(shape_ndim):
             shape_vars.append(tvm.tir.Var("x_%d" % i, "int64"))
         bb.match_cast(shape_dataflow_var, relax.ShapeStructInfo(shape_vars))
-        return bb.normalize(attach_span(relax.op.broadcast_to(data, relax.ShapeExpr(shape_vars))))
+        return normalize_with_span(bb, relax.op.broadcast_to(data, relax.ShapeExpr(shape_vars)))
 
 
 class Attention(OnnxOpConverter):
@@ -993,20 +1174,15 @@ class Attention(OnnxOpConverter):
         else:
             mask_filter_value = -10000.0
 
+        # Inputs come from already normalized nodes, so their struct info can be read directly.
         # (batch_size, sequence_length, input_hidden_size)
-        input_emb = bb.normalize(inputs[0])
+        input_emb = inputs[0]
 
         # (input_hidden_size, hidden_size + hidden_size + v_hidden_size)
-        weight = bb.normalize(inputs[1])
-
-        def optional_input(k: int):
-            if inputs[k] is not None:
-                return bb.normalize(inputs[k])
-            else:
-                return None
+        weight = inputs[1]
 
         # (hidden_size + hidden_size + v_hidden_size)
-        bias = optional_input(2)
+        bias = inputs[2]
 
         # 1. (    batch_size,             1,   max_seq_len, max_seq_len,)
         # 2. (    batch_size, total_seq_len,)
@@ -1014,20 +1190,18 @@ class Attention(OnnxOpConverter):
         # 4. (    batch_size,)
         # 5. (2 * batch_size,)
         # For now, we only support case 2 & 3.
-        mask_index = optional_input(3)
+        mask_index = inputs[3]
 
         # (2, batch_size, num_heads, past_sequence_length, head_size)
         assert inputs[4] is None, "past state for key and value is not currently supported"
 
         # (batch_size, num_heads, sequence_length, total_sequence_length)
-        qk_bias = optional_input(5)
+        qk_bias = inputs[5]
 
         assert inputs[6] is None, "past_sequence_length is not currently supported"
 
-        (batch_size, seq_len, input_hidden_size) = [
-            val.value for val in input_emb.struct_info.shape.values
-        ]
-        weight_shape = [val.value for val in weight.struct_info.shape.values]
+        (batch_size, seq_len, input_hidden_size) = _get_static_shape(input_emb)
+        weight_shape = _get_static_shape(weight)
 
         assert (
             weight_shape[0] == input_hidden_size
@@ -1048,68 +1222,66 @@ class Attention(OnnxOpConverter):
         head_size_v = hidden_size_v // num_heads
 
         if mask_index is not None:
-            mask_index_shape = [val.value for val in mask_index.struct_info.shape.values]
-            assert mask_index_shape in (
-                [batch_size, seq_len],
-                [
-                    batch_size,
-                    seq_len,
-                    seq_len,
-                ],
+            mask_index_shape = _shape_values(mask_index.struct_info.shape)
+            valid_mask_shapes = ((batch_size, seq_len), (batch_size, seq_len, seq_len))
+            assert (
+                mask_index_shape in valid_mask_shapes
             ), """mask index should be in shape of (batch_size, seq_len),
             or (batch_size, seq_len, seq_len)"""
             mask_bias = attach_span(
-                relax.op.subtract(relax.const(1, dtype=mask_index.struct_info.dtype), mask_index)
+                relax.op.subtract(_scalar_const(1, mask_index.struct_info.dtype), mask_index)
             )
             mask_bias = attach_span(relax.op.astype(mask_bias, dtype=input_emb.struct_info.dtype))
-            mask_bias = bb.normalize(
-                attach_span(
-                    relax.op.multiply(
-                        mask_bias,
-                        relax.const(mask_filter_value, dtype=input_emb.struct_info.dtype),
-                    )
-                )
+            mask_bias = normalize_with_span(
+                bb,
+                relax.op.multiply(
+                    mask_bias,
+                    _scalar_const(mask_filter_value, input_emb.struct_info.dtype),
+                ),
             )
             if qk_bias is None:
                 qk_bias = mask_bias
             else:
                 if len(mask_index_shape) == 2:
-                    mask_bias = bb.normalize(
-                        attach_span(relax.op.reshape(mask_bias, [batch_size, 1, 1, seq_len]))
+                    mask_bias = normalize_with_span(
+                        bb, relax.op.reshape(mask_bias, [batch_size, 1, 1, seq_len])
                     )
                 elif len(mask_index_shape) == 3:
-                    mask_bias = bb.normalize(
-                        attach_span(relax.op.reshape(mask_bias, [batch_size, 1, seq_len, seq_len]))
+                    mask_bias = normalize_with_span(
+                        bb, relax.op.reshape(mask_bias, [batch_size, 1, seq_len, seq_len])
                     )
-                qk_bias = bb.normalize(attach_span(relax.op.add(qk_bias, mask_bias)))
+                qk_bias = normalize_with_span(bb, relax.op.add(qk_bias, mask_bias))
 
         QKV = attach_span(relax.op.matmul(input_emb, weight))
 
         if bias:
-            bias_shape = [val.value for val in bias.struct_info.shape.values]
+            bias_shape = _get_static_shape(bias)
             assert (
                 bias_shape[0] == weight_shape[1]
             ), "bias and weight should share the same hidden size sum"
             QKV = attach_span(relax.op.add(QKV, bias))
 
-        QKV = attach_span(relax.op.split(QKV, [hidden_size, hidden_size * 2], 2))
-        Q, K, V = QKV[0], QKV[1], QKV[2]
+        if hidden_size == hidden_size_v:
+            # Split the heads out of the packed projection with a single reshape, so the
+            # split directly yields Q, K and V in (batch, seq, heads, head_size) layout.
+            QKV = attach_span(
+                relax.op.reshape(QKV, (batch_size, seq_len, 3 * num_heads, head_size))
+            )
+            QKV = attach_span(relax.op.split(QKV, [num_heads, num_heads * 2], 2))
+            Q, K, V = QKV[0], QKV[1], QKV[2]
+        else:
+            QKV = attach_span(relax.op.split(QKV, [hidden_size, hidden_size * 2], 2))
+            Q, K, V = QKV[0], QKV[1], QKV[2]
 
-        Q = bb.normalize(
-            attach_span(relax.op.reshape(Q, (batch_size, seq_len, num_heads, head_size)))
-        )
-        K = bb.normalize(
-            attach_span(relax.op.reshape(K, (batch_size, seq_len, num_heads, head_size)))
-        )
-        V = bb.normalize(
-            attach_span(relax.op.reshape(V, (batch_size, seq_len, num_heads, head_size_v)))
-        )
+            Q = attach_span(relax.op.reshape(Q, (batch_size, seq_len, num_heads, head_size)))
+            K = attach_span(relax.op.reshape(K, (batch_size, seq_len, num_heads, head_size)))
+            V = attach_span(relax.op.reshape(V, (batch_size, seq_len, num_heads, head_size_v)))
         output = attach_span(relax.op.nn.attention(Q, K, V, qk_bias))
-        output = bb.normalize(
-            attach_span(relax.op.reshape(output, (batch_size, seq_len, num_heads * head_size_v)))
+        output = normalize_with_span(
+            bb, relax.op.reshape(output, (batch_size, seq_len, num_heads * head_size_v))
         )
         # add placeholder for optional present state supported in the future
-        placeholder = relax.const(0, dtype="float32")
+        placeholder = _scalar_const(0, "float32")
         return relax.Tuple([output, placeholder])
 
 
@@ -1171,14 +1343,15 @@ class Resize(OnnxOpConverter):
         # Convert scales to sizes if needed.
         if scales is not None:
             assert isinstance(scales, relax.Constant), "Only constant scales currently supported."
-            scales = scales.data.numpy()
-            sizes_shape = [dim.value for dim in x.struct_info.shape]
-            sizes = (sizes_shape * scales)[2:].astype("int64").tolist()
+            sizes = [
+                int(dim * scale)
+                for dim, scale in zip(_get_static_shape(x)[2:], _const_to_list(scales)[2:])
+            ]
         else:
             assert isinstance(
                 sizes, relax.Constant
             ), "Only constant output size currently supported."
-            sizes = sizes.data.numpy().astype("int64").tolist()[2:]
+            sizes = [int(size) for size in _const_to_list(sizes)[2:]]
 
         # TODO(jwfromm) relax.image.resize2d runs into some issues with dynamism.
         return emit_te_with_span(
@@ -1225,9 +1398,9 @@ class Range(OnnxOpConverter):
         assert isinstance(delta, relax.Constant), "Constant delta required for Range."
         step = delta.data.numpy().tolist()
 
-        # If all inputs are constant, compute directly.
-        if isinstance(start, int) and isinstance(limit, int):
-            out_range = _np.arange(start=start, stop=limit, step=step)
+        # If all inputs are constant, compute directly in the output dtype.
+        if not isinstance(start, relax.Expr) and not isinstance(limit, relax.Expr):
+            out_range = _np.arange(start, limit, step, dtype=out_dtype)
             return relax.const(out_range, out_dtype)
 
         # Otherwise compute in graph.
@@ -1243,18 +1416,38 @@ class InstanceNormalization(OnnxOpConverter):
         scale = inputs[1]
         B = inputs[2]
         epsilon = attr.get("epsilon", 1e-05)
-        epsilon = relax.const(epsilon, dtype=data.struct_info.dtype)
 
         ndim = len(data.struct_info.shape)
         redux_axes = list(range(2, ndim))
 
+        # Instance normalization is group normalization with one group per channel, which
+        # lowers to a single fused kernel when the channel count is static. The group_norm
+        # legalization only supports float32 and float16 inputs.
+        channels = data.struct_info.shape[1]
+        if (
+            isinstance(channels, tvm.tir.IntImm)
+            and data.struct_info.dtype in ("float32", "float16")
+            and scale is not None
+            and B is not None
+        ):
+            return attach_span(
+                relax.op.nn.group_norm(
+                    data,
+                    scale,
+                    B,
+                    num_groups=channels.value,
+                    channel_axis=1,
+                    axes=redux_axes,
+                    epsilon=epsilon,
+                )
+            )
+
+        epsilon = _scalar_const(epsilon, data.struct_info.dtype)
         mean = attach_span(relax.op.mean(data, axis=redux_axes, keepdims=True))
         var = attach_span(relax.op.variance(data, axis=redux_axes, keepdims=True))
         sqrt = attach_span(relax.op.sqrt(attach_span(relax.op.add(var, epsilon))))
         out = attach_span(relax.op.divide(attach_span(relax.op.subtract(data, mean)), sqrt))
-        broadcast_shape = [-1] + [
-            1,
-        ] * (ndim - 2)
+        broadcast_shape = (-1,) + (1,) * (ndim - 2)
         if scale is not None:
             scale = attach_span(relax.op.reshape(scale, broadcast_shape))
             out = attach_span(relax.op.multiply(out, scale))
@@ -1305,31 +1498,25 @@ class MaxPool(OnnxOpConverter):
 
         if auto_pad in ("SAME_UPPER", "SAME_LOWER"):
             input_spatial_shape = cls._get_input_spatial_shape(data)
-            output_spatial_shape = [0 for _ in input_spatial_shape]
-
-            pads = _np.array([(0, 0) for _ in range(len(kernel_shape))])
-
-            for i, _ in enumerate(input_spatial_shape):
+            pads_before, pads_after = [], []
+            for in_size, stride, kernel, dilation in zip(
+                input_spatial_shape, strides, kernel_shape, dilations
+            ):
                 if auto_pad == "SAME_UPPER":
-                    output_spatial_shape[i] = int(_np.ceil(input_spatial_shape[i] / strides[i]))
+                    out_size = -(-in_size // stride)
                 else:
-                    output_spatial_shape[i] = int(_np.floor(input_spatial_shape[i] / strides[i]))
-                pad_i = (
-                    (output_spatial_shape[i] - 1) * strides[i]
-                    + ((kernel_shape[i] - 1) * dilations[i] + 1)
-                    - input_spatial_shape[i]
-                )
+                    out_size = in_size // stride
+                pad = (out_size - 1) * stride + (kernel - 1) * dilation + 1 - in_size
+                # SAME_UPPER puts the extra padding at the end, SAME_LOWER at the beginning.
                 if auto_pad == "SAME_UPPER":
-                    pads[i, 0] = pad_i // 2
-                    pads[i, 1] = pad_i - pads[i, 0]
+                    pads_before.append(pad // 2)
                 else:
-                    pads[i, 1] = pad_i // 2
-                    pads[i, 0] = pad_i - pads[i, 1]
+                    pads_before.append(pad - pad // 2)
+                pads_after.append(pad - pads_before[-1])
 
             # TODO(agladyshev): for now we support only 2D kernel
             # (top, left, bottom, right)
-            flatten_pads = [pads[0][0], pads[1][0], pads[0][1], pads[1][1]]
-            pads = tuple(flatten_pads)
+            pads = tuple(pads_before + pads_after)
 
         return attach_span(
             relax.op.nn.max_pool2d(data, kernel_shape, strides, pads, dilations, ceil_mode)
@@ -1338,7 +1525,7 @@ class MaxPool(OnnxOpConverter):
     @classmethod
     def _get_input_spatial_shape(cls, tensor):
         # shape is (N x C x D1 x D2 ... Dn)
-        return _np.array([int(d) for d in tensor.struct_info.shape], dtype="int64")[2:]
+        return tuple(_get_static_shape(tensor)[2:])
 
 
 class GlobalAveragePool(OnnxOpConverter):
@@ -1355,8 +1542,9 @@ class Flatten(OnnxOpConverter):
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
         axis = attr.get("axis", 1)
-        data_shape = [i.value for i in inputs[0].struct_info.shape]
-        new_shape = (1, -1) if axis == 0 else (_np.prod(data_shape[0:axis]).astype("int64"), -1)
+        data_shape = _get_static_shape(inputs[0])
+        # math.prod is not available in Python 3.7, so reduce the python ints directly.
+        new_shape = (functools.reduce(lambda x, y: x * y, data_shape[0:axis], 1), -1)
         return attach_span(relax.op.reshape(inputs[0], new_shape))
 
 
@@ -1374,7 +1562,7 @@ class LayerNormalization(OnnxOpConverter):
         output = attach_span(relax.op.nn.layer_norm(data, scale, bias, axis, epsilon))
         # Onnx layernorm has 3 outputs but only the first is used.
         # We construct two empty constants for this.
-        placeholder = relax.const(0, dtype="float32")
+        placeholder = _scalar_const(0, "float32")
         return relax.Tuple([output, placeholder, placeholder])
 
 
@@ -1416,7 +1604,7 @@ class ReduceSum(OnnxOpConverter):
         axes = inputs[1]
         keepdims = attr.get("keepdims", 1)
         assert isinstance(axes, relax.Constant), "Only constant axes currently supported."
-        axes = axes.data.numpy().tolist()
+        axes = _const_to_list(axes)
         return attach_span(relax.op.sum(data, axes, keepdims))
 
 
@@ -1450,13 +1638,7 @@ class ReduceLogSumExp(OnnxOpConverter):
         x = inputs[0]
         axes = attr.get("axes", None)
         keepdims = attr.get("keepdims", 1)
-        max_x = attach_span(relax.op.max(x, axes, True))
-        exp_x = attach_span(relax.op.exp(attach_span(relax.op.subtract(x, max_x))))
-        sum_x = attach_span(relax.op.sum(exp_x, axes, True))
-        out_x = attach_span(relax.op.add(attach_span(relax.op.log(sum_x)), max_x))
-        if not keepdims:
-            out_x = attach_span(relax.op.squeeze(out_x, axes))
-        return out_x
+        return emit_te_with_span(bb, topi.logsumexp, x, axes, bool(keepdims))
 
 
 class ReduceLogSum(OnnxOpConverter):
@@ -1470,6 +1652,11 @@ class ReduceLogSum(OnnxOpConverter):
         return attach_span(relax.op.log(attach_span(relax.op.sum(data, axes, keepdims))))
 
 
+def _sum_square(data: tvm.te.Tensor, axis: Optional[List[int]], keepdims: bool) -> tvm.te.Tensor:
+    """Sum of squares emitted as one PrimFunc, letting the square be inlined into the reduction."""
+    return topi.sum(topi.multiply(data, data), axis, keepdims)
+
+
 class ReduceSumSquare(OnnxOpConverter):
     """Converts an onnx ReduceSumSquare node into an equivalent Relax expression."""
 
@@ -1478,7 +1665,9 @@ class ReduceSumSquare(OnnxOpConverter):
         data = inputs[0]
         axes = attr.get("axes", None)
         keepdims = attr.get("keepdims", 1)
-        return attach_span(relax.op.sum(attach_span(relax.op.multiply(data, data)), axes, keepdims))
+        return emit_te_with_span(
+            bb, _sum_square, data, axes, bool(keepdims), primfunc_name_hint="sum_square"
+        )
 
 
 class ReduceL1(OnnxOpConverter):
@@ -1500,44 +1689,44 @@ class ReduceL2(OnnxOpConverter):
         data = inputs[0]
         axes = attr.get("axes", None)
         keepdims = attr.get("keepdims", 1)
-        return attach_span(
-            relax.op.sqrt(
-                attach_span(
-                    relax.op.sum(attach_span(relax.op.multiply(data, data)), axes, keepdims)
-                )
-            )
+        return emit_te_with_span(
+            bb,
+            lambda x: topi.sqrt(_sum_square(x, axes, bool(keepdims))),
+            data,
+            primfunc_name_hint="l2_norm",
         )
 
 
+def _get_arg_reduce_attrs(data: relax.Expr, attr: Dict, shift_axis: bool = True):
+    """Get the axis and keepdims attributes of an ArgMax or ArgMin node."""
+    dims_num = len(data.struct_info.shape)
+    axis = attr.get("axis", 0)
+    if shift_axis and axis < 0:
+        axis += dims_num
+    assert 0 <= axis < dims_num, "Axis is out of bounds"
+    keepdims = attr.get("keepdims", True)
+    return axis, keepdims
+
+
 class ArgMax(OnnxOpConverter):
     """Converts an onnx ArgMax node into an equivalent Relax expression."""
 
-    @classmethod
-    def _check_attrs(cls, data, attr, shift_axis=True):
-        dims_num = len(data.struct_info.shape)
-        axis = attr.get("axis", 0)
-        if shift_axis and axis < 0:
-            axis += dims_num
-        assert 0 <= axis < dims_num, "Axis is out of bounds"
-        keepdims = attr.get("keepdims", True)
-        return axis, keepdims
-
     @classmethod
     def _impl_v1(cls, bb, inputs, attr):
         data = inputs[0]
-        axis, keepdims = cls._check_attrs(data, attr, False)
+        axis, keepdims = _get_arg_reduce_attrs(data, attr, False)
         return attach_span(relax.op.argmax(data, axis, keepdims))
 
     @classmethod
     def _impl_v11(cls, bb, inputs, attr):
         data = inputs[0]
-        axis, keepdims = cls._check_attrs(data, attr)
+        axis, keepdims = _get_arg_reduce_attrs(data, attr)
         return attach_span(relax.op.argmax(data, axis, keepdims))
 
     @classmethod
     def _impl_v12(cls, bb, inputs, attr):
         data = inputs[0]
-        axis, keepdims = cls._check_attrs(data, attr)
+        axis, keepdims = _get_arg_reduce_attrs(data, attr)
         select_last_index = attr.get("select_last_index", False)
         if select_last_index:
             # TODO(vvchernov): support attr
@@ -1550,32 +1739,22 @@ class ArgMax(OnnxOpConverter):
 class ArgMin(OnnxOpConverter):
     """Converts an onnx ArgMin node into an equivalent Relax expression."""
 
-    @classmethod
-    def _check_attrs(cls, data, attr, shift_axis=True):
-        dims_num = len(data.struct_info.shape)
-        axis = attr.get("axis", 0)
-        if shift_axis and axis < 0:
-            axis += dims_num
-        assert 0 <= axis < dims_num, "Axis is out of bounds"
-        keepdims = attr.get("keepdims", True)
-        return axis, keepdims
-
     @classmethod
     def _impl_v1(cls, bb, inputs, attr):
         data = inputs[0]
-        axis, keepdims = cls._check_attrs(data, attr, False)
+        axis, keepdims = _get_arg_reduce_attrs(data, attr, False)
         return attach_span(relax.op.argmin(data, axis, keepdims))
 
     @classmethod
     def _impl_v11(cls, bb, inputs, attr):
         data = inputs[0]
-        axis, keepdims = cls._check_attrs(data, attr)
+        axis, keepdims = _get_arg_reduce_attrs(data, attr)
         return attach_span(relax.op.argmin(data, axis, keepdims))
 
     @classmethod
     def _impl_v12(cls, bb, inputs, attr):
         data = inputs[0]
-        axis, keepdims = cls._check_attrs(data, attr)
+        axis, keepdims = _get_arg_reduce_attrs(data, attr)
         select_last_index = attr.get("select_last_index", False)
         if select_last_index:
             # TODO(vvchernov): support attr
@@ -1609,10 +1788,18 @@ class SkipLayerNormalization(OnnxOpConverter):
         output = attach_span(relax.op.nn.layer_norm(data, gamma, beta, axes=-1, epsilon=epsilon))
 
         # Expects three outputs though only the first is used. Construct a placeholder for others.
-        placeholder = relax.const(0, dtype="float32")
+        placeholder = _scalar_const(0, "float32")
         return relax.Tuple([output, placeholder, placeholder])
 
 
+def _embedding_sum(*tables_and_ids: tvm.te.Tensor) -> tvm.te.Tensor:
+    """Sum the embedding lookups given as alternating (table, ids) pairs."""
+    lookups = [
+        topi.take(table, ids, 0) for table, ids in zip(tables_and_ids[::2], tables_and_ids[1::2])
+    ]
+    return functools.reduce(topi.add, lookups)
+
+
 class EmbedLayerNormalization(OnnxOpConverter):
     """Converts a microsoft contrib EmbedLayerNormalization node into a Relax expression."""
 
@@ -1630,29 +1817,31 @@ class EmbedLayerNormalization(OnnxOpConverter):
 
         epsilon = attr.get("epsilon", 1e-12)
 
-        (batch_size, seq_len) = [dim.value for dim in input_ids.struct_info.shape]
+        (batch_size, seq_len) = _get_static_shape(input_ids)
 
         if segment_ids:
             assert segment_emb
 
         if pos_ids is None:
-            pos_ids = relax.const([list(range(seq_len))] * batch_size, dtype="int64")
+            pos_ids = emit_te_with_span(bb, topi.arange, 0, seq_len, 1, "int64")
+            pos_ids = normalize_with_span(bb, relax.op.broadcast_to(pos_ids, (batch_size, seq_len)))
         # TODO(jwfromm) Replace with relax ops once take has better support.
-        word_vec = emit_te_with_span(bb, topi.take, word_emb, input_ids, 0)
+        # All lookups and their sum are emitted as one PrimFunc, so the gathered embeddings are
+        # not each written out as a separate tensor.
+        embeddings = [word_emb, input_ids, pos_emb, pos_ids]
         if segment_ids:
-            segment_vec = emit_te_with_span(bb, topi.take, segment_emb, segment_ids, 0)
-        pos_vec = emit_te_with_span(bb, topi.take, pos_emb, pos_ids, 0)
-
-        vec_sum = attach_span(relax.op.add(word_vec, pos_vec))
-        if segment_ids:
-            vec_sum = attach_span(relax.op.add(vec_sum, segment_vec))
+            embeddings += [segment_emb, segment_ids]
+        vec_sum = emit_te_with_span(
+            bb, _embedding_sum, *embeddings, primfunc_name_hint="embedding_sum"
+        )
 
         ln = attach_span(relax.op.nn.layer_norm(vec_sum, gamma, beta, axes=-1, epsilon=epsilon))
 
-        mask_index = relax.const(_np.zeros((batch_size,), dtype="int64"))
         if mask:
             # Caculate number of words per sentence.
             mask_index = attach_span(relax.op.sum(mask, axis=1))
+        else:
+            mask_index = attach_span(relax.op.zeros((batch_size,), "int64"))
 
         return relax.Tuple([ln, mask_index])
 
@@ -1662,9 +1851,9 @@ class Greater(OnnxOpConverter):
 
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
-        if all([isinstance(inp, relax.Constant) for inp in inputs]):
-            output = _np.greater(inputs[0].data.numpy(), inputs[1].data.numpy())
-            return relax.const(output, output.dtype)
+        output = _try_const_fold(inputs, _np.greater)
+        if output is not None:
+            return output
         return attach_span(relax.op.greater(inputs[0], inputs[1]))
 
 
@@ -1674,7 +1863,10 @@ class Reciprocal(OnnxOpConverter):
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
         input_dtype = inputs[0].struct_info.dtype
-        return attach_span(relax.op.divide(relax.const(1, dtype=input_dtype), inputs[0]))
+        output = _try_const_fold(inputs, _np.reciprocal, input_dtype)
+        if output is not None:
+            return output
+        return attach_span(relax.op.divide(_scalar_const(1, input_dtype), inputs[0]))
 
 
 class OneHot(OnnxOpConverter):
@@ -1688,14 +1880,28 @@ class OneHot(OnnxOpConverter):
         axis = attr.get("axis", -1)
         dtype = values.struct_info.dtype
         assert isinstance(depth, relax.Constant), "Only constant depth currently supported."
-        depth = depth.data.numpy().tolist()
+        depth = depth.data.numpy().item()
         assert isinstance(values, relax.Constant), "Only constant values currently supported."
         values = values.data.numpy().tolist()
         off_value, on_value = values
+
+        def _np_one_hot(data):
+            # Negative indices count back from depth. The depth axis is compared against an
+            # arange broadcast along the output axis.
+            data = _np.where(data < 0, data + depth, data)
+            out_axis = axis if axis >= 0 else axis + data.ndim + 1
+            positions = _np.arange(depth).reshape([-1] + [1] * (data.ndim - out_axis))
+            return _np.where(_np.expand_dims(data, out_axis) == positions, on_value, off_value)
+
+        output = _try_const_fold([indices], _np_one_hot, dtype)
+        if output is not None:
+            return output
         return emit_te_with_span(bb, topi.one_hot, indices, on_value, off_value, depth, axis, dtype)
 
 
-def _get_convert_map():
+@functools.lru_cache(maxsize=None)
+def _get_convert_map() -> Dict[str, Type[OnnxOpConverter]]:
+    """Map each supported ONNX operator name to its converter, built once per process."""
     return {
         "MatMul": MatMul,
         "Concat": Concat,
@@ -1775,6 +1981,14 @@ def _get_convert_map():
     }
 
 
+@functools.lru_cache(maxsize=None)
+def _get_dispatch_map(opset: int) -> Dict[str, Callable]:
+    """Resolve the converter implementation of every supported operator for an opset."""
+    return {
+        op_name: converter.get_converter(opset) for op_name, converter in _get_convert_map().items()
+    }
+
+
 class ONNXGraphImporter:
     """A helper class for handling Relax expression copying from pb2.GraphProto.
     Definition: https://github.com/onnx/onnx/blob/main/onnx/onnx.proto
@@ -1787,6 +2001,8 @@ class ONNXGraphImporter:
         The input types to the graph
     sanitize : bool
         Whether to sanitize the input names to be valid Relax identifiers.
+    attach_spans : bool
+        Whether to attach a span naming the source ONNX node to each converted op.
     """
 
     current = None
@@ -1796,6 +2012,7 @@ class ONNXGraphImporter:
         shape_dict: Dict[str, List],
         dtype_dict: Union[str, Dict[str, str]],
         sanitize: bool = True,
+        attach_spans: bool = True,
     ):
         self._nodes: Dict[str, relax.Expr] = {}
         self._inputs: Dict[str, relax.Var] = {}
@@ -1806,7 +2023,10 @@ class ONNXGraphImporter:
         self.opset: int = None
         self._name_supply = NameSupply()
         self._sanitize: bool = sanitize
+        self._attach_spans: bool = attach_spans
         self.bb: relax.BlockBuilder = relax.BlockBuilder()  # pylint: disable=invalid-name
+        # Results of helpers memoized while this importer converts a graph.
+        self.memo: Dict[Any, Any] = {}
 
     def from_onnx(self, graph: onnx.onnx_ml_pb2.ModelProto, opset: int) -> IRModule:
         """Construct Relax expressions from the ONNX graph.
@@ -1822,22 +2042,27 @@ class ONNXGraphImporter:
         mod : tvm.IRModule
             The returned relax module
         """
-        with self.bb.function("main"):
-            with self.bb.dataflow() as df:  # pylint: disable=invalid-name, unused-variable
-                self.opset = opset
-                self._parse_graph_initializers(graph)
-                self._parse_graph_input(graph)
-                self._check_for_unsupported_ops(graph)
-                self._construct_nodes(graph)
-
-                # now return the outputs
-                outputs = [self._nodes[self._parse_value_proto(i)] for i in graph.output]
-                outputs = outputs[0] if len(outputs) == 1 else relax.Tuple(outputs)
-
-                # Create a function from our output expression and all input variables.
-                param_list = [v for k, v in self._inputs.items() if isinstance(v, relax.Var)]
-                output_var = self.bb.emit_output(outputs)
-            self.bb.emit_func_output(output_var, params=param_list)
+        previous, ONNXGraphImporter.current = ONNXGraphImporter.current, self
+        try:
+            with self.bb.function("main"):
+                with self.bb.dataflow() as df:  # pylint: disable=invalid-name, unused-variable
+                    self.opset = opset
+                    self._parse_graph_initializers(graph)
+                    self._parse_graph_input(graph)
+                    self._check_for_unsupported_ops(graph)
+                    self._construct_nodes(graph)
+
+                    # now return the outputs
+                    outputs = [self._nodes[self._parse_value_proto(i)] for i in graph.output]
+                    outputs = outputs[0] if len(outputs) == 1 else relax.Tuple(outputs)
+
+                    # Create a function from our output expression and all input variables.
+                    param_list = [v for k, v in self._inputs.items() if isinstance(v, relax.Var)]
+                    output_var = self.bb.emit_output(outputs)
+                self.bb.emit_func_output(output_var, params=param_list)
+        finally:
+            ONNXGraphImporter.current = previous
+            self.memo.clear()
         relax_mod = self.bb.get()
         return relax_mod
 
@@ -1846,8 +2071,39 @@ class ONNXGraphImporter:
         for init_tensor in graph.initializer:
             if not init_tensor.name.strip():
                 raise ValueError("Tensor's name is required.")
-            array = self._parse_array(init_tensor)
-            self._nodes[init_tensor.name] = relax.const(array)
+        # Initializers with identical contents are decoded once and share a constant. Only those
+        # whose dtype and shape match another initializer need their raw bytes hashed.
+        signature_counts = collections.Counter(
+            (init_tensor.data_type, tuple(init_tensor.dims)) for init_tensor in graph.initializer
+        )
+        unique_tensors = {}
+        keys = []
+        for init_tensor in graph.initializer:
+            key = init_tensor.name
+            signature = (init_tensor.data_type, tuple(init_tensor.dims))
+            if signature_counts[signature] > 1 and init_tensor.HasField("raw_data"):
+                key = signature + (hashlib.sha256(init_tensor.raw_data).digest(),)
+            keys.append(key)
+            unique_tensors.setdefault(key, init_tensor)
+        # Copying weights into NDArrays releases the GIL, so large initializers are decoded on a
+        # thread pool. The Relax constants themselves are still created on this thread.
+        large_keys = [
+            key
+            for key, init_tensor in unique_tensors.items()
+            if init_tensor.ByteSize() >= _PARALLEL_DECODE_MIN_BYTES
+        ]
+        arrays = {}
+        if len(large_keys) > 1:
+            max_workers = min(len(large_keys), os.cpu_count() or 1)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                decoded = executor.map(self._parse_array, [unique_tensors[k] for k in large_keys])
+                arrays = dict(zip(large_keys, decoded))
+        constants = {
+            key: relax.const(arrays[key] if key in arrays else self._parse_array(init_tensor))
+            for key, init_tensor in unique_tensors.items()
+        }
+        for init_tensor, key in zip(graph.initializer, keys):
+            self._nodes[init_tensor.name] = constants[key]
 
     def _sanitize_name(self, name: str) -> str:
         """Sanitize a name to make it a valid identifier.
@@ -1873,9 +2129,6 @@ class ONNXGraphImporter:
             new_name = str(self._name_supply.fresh_name("input_" + new_name))
         else:
             new_name = str(self._name_supply.fresh_name(new_name))
-
-        if new_name != name:
-            warnings.warn(("Renaming name %s to %s" % (name, new_name)))
         return new_name
 
     def _new_var(self, var_name: str, shape: List, dtype: str = "float32"):
@@ -1884,10 +2137,15 @@ class ONNXGraphImporter:
 
     def _parse_graph_input(self, graph: onnx.onnx_ml_pb2.GraphProto):
         """Parse model inputs to Relax parameters."""
+        # Symbolic dimensions with the same name share a variable across inputs.
+        dim_vars = {}
+        # Collect warnings so each kind is reported once for the whole graph.
+        unknown_shapes = []
+        renamed = []
         for i in graph.input:
             # from onnx v0.2, GraphProto.input has type ValueInfoProto,
             #  and the name is 'i.name'
-            i_name, i_shape, d_type, i_shape_name = get_info(i)
+            i_name, i_shape, d_type, i_shape_name = get_info(i, dim_vars)
             if i_name not in self._nodes:
                 self._num_input += 1
                 self._input_names.append(i_name)
@@ -1895,19 +2153,23 @@ class ONNXGraphImporter:
                     i_shape = self._shape[i_name]
                 else:
                     if "?" in str(i_shape):
-                        warning_msg = (
-                            "Input %s has unknown dimension shapes: %s. "
-                            "Specifying static values may improve performance"
-                            % (i_name, str(i_shape_name))
-                        )
-                        warnings.warn(warning_msg)
+                        unknown_shapes.append("%s: %s" % (i_name, str(i_shape_name)))
                 if isinstance(self._dtype, dict):
                     dtype = self._dtype[i_name] if i_name in self._dtype else d_type
                 else:
                     dtype = d_type
                 var_name = self._sanitize_name(i_name) if self._sanitize else i_name
+                if var_name != i_name:
+                    renamed.append("%s to %s" % (i_name, var_name))
                 self._nodes[i_name] = self._new_var(var_name, shape=i_shape, dtype=dtype)
             self._inputs[i_name] = self._nodes[i_name]
+        if unknown_shapes:
+            warnings.warn(
+                "Inputs have unknown dimension shapes. "
+                "Specifying static values may improve performance:\n" + "\n".join(unknown_shapes)
+            )
+        if renamed:
+            warnings.warn("Renaming inputs:\n" + "\n".join(renamed))
 
     def _check_for_unsupported_ops(self, graph: onnx.onnx_ml_pb2.GraphProto):
         convert_map = _get_convert_map()
@@ -1927,51 +2189,64 @@ class ONNXGraphImporter:
 
     def _construct_nodes(self, graph: onnx.onnx_ml_pb2.GraphProto):
         """Nodes are stored as directed acyclic graph."""
+        # Bind frequently used attributes to locals once rather than once per node.
+        nodes = self._nodes
+        bb = self.bb
+        opset = self.opset
+        convert_map = _get_convert_map()
+        converted = {}
         for node_index, node in enumerate(graph.node):
             op_name = node.op_type
             attr = self._parse_attr(node.attribute)
             # Create and populate input list.
-            inputs = onnx_input()
-            for i in node.input:
-                if i != "":
-                    inputs.append(self._nodes[i])
-                else:
-                    inputs.append(None)
+            inputs = onnx_input(nodes[i] if i != "" else None for i in node.input)
             i_name = self._parse_value_proto(node)
             outputs = node.output
-            attr["tvm_custom"] = {}
-            attr["tvm_custom"]["name"] = i_name
-            attr["tvm_custom"]["num_outputs"] = len(outputs)
-
-            # Perform special handling for shape expressions. If an input is a
-            # shape expr, make sure the current op can handle it, otherwise
-            # convert it to a tensor.
-            shape_compatible_ops = ["Reshape", "ConstantOfShape", "Gather", "Slice", "Expand"]
-            for i, inp in enumerate(inputs):
-                if (
-                    inp is not None
-                    and isinstance(inp.struct_info, relax.ShapeStructInfo)
-                    and op_name not in shape_compatible_ops
-                ):
-                    raise ValueError(f"Node {node.name} cannot handle ShapeExpr inputs.")
-
-            op = self._convert_operator(op_name, node_index, inputs, attr, self.opset)
-            # Create struct information for the new operator.
-            op = self.bb.normalize(op)
-
-            if not isinstance(op, relax.Tuple):
-                if isinstance(op.checked_type, tvm.ir.type.TupleType):
-                    # This is a var bound to a tuple. We need to unpack it and create
-                    # a new tuple.
-                    tuple_items = []
-                    for i in range(len(op.checked_type.fields)):
-                        tuple_items.append(self.bb.emit(relax.TupleGetItem(op, i)))
-                    op = relax.Tuple(tuple_items)
-                    outputs_num = len(tuple_items)
-                else:
-                    outputs_num = 1
+            # A node repeating the op, inputs and attributes of an earlier node reuses its result,
+            # unless its converter is marked as nondeterministic.
+            cse_key = None
+            converter = convert_map.get(op_name)
+            if converter is not None and not converter.nondeterministic:
+                cse_key = (
+                    op_name,
+                    tuple(inputs),
+                    len(outputs),
+                    tuple(sorted((k, _hashable_attr(v)) for k, v in attr.items())),
+                )
+            if cse_key in converted:
+                op, outputs_num = converted[cse_key]
             else:
-                outputs_num = len(op)
+                attr["tvm_custom"] = {}
+                attr["tvm_custom"]["name"] = i_name
+                attr["tvm_custom"]["num_outputs"] = len(outputs)
+
+                # Perform special handling for shape expressions. If an input is a
+                # shape expr, make sure the current op can handle it, otherwise
+                # convert it to a tensor.
+                if op_name not in _SHAPE_COMPATIBLE_OPS:
+                    for inp in inputs:
+                        if inp is not None and isinstance(inp.struct_info, relax.ShapeStructInfo):
+                            raise ValueError(f"Node {node.name} cannot handle ShapeExpr inputs.")
+
+                op = self._convert_operator(op_name, node_index, inputs, attr, opset)
+                # Create struct information for the new operator.
+                op = bb.normalize(op)
+
+                if not isinstance(op, relax.Tuple):
+                    if isinstance(op.checked_type, tvm.ir.type.TupleType):
+                        # This is a var bound to a tuple. We need to unpack it and create
+                        # a new tuple.
+                        tuple_items = []
+                        for i in range(len(op.checked_type.fields)):
+                            tuple_items.append(bb.emit(relax.TupleGetItem(op, i)))
+                        op = relax.Tuple(tuple_items)
+                        outputs_num = len(tuple_items)
+                    else:
+                        outputs_num = 1
+                else:
+                    outputs_num = len(op)
+                if cse_key is not None:
+                    converted[cse_key] = (op, outputs_num)
             assert (
                 len(outputs) <= outputs_num
             ), "Missing outputs during conversion. Expected {} but Got {} in {}.".format(
@@ -1979,10 +2254,10 @@ class ONNXGraphImporter:
             )
 
             if outputs_num == 1:
-                self._nodes[outputs[0]] = op
+                nodes[outputs[0]] = op
             else:
                 for k, i in zip(list(outputs), range(len(outputs))):
-                    self._nodes[k] = op[i]
+                    nodes[k] = op[i]
 
     def _parse_value_proto(self, value_proto: onnx.onnx_ml_pb2.GraphProto):
         """Parse ValueProto or raw str."""
@@ -1993,13 +2268,27 @@ class ONNXGraphImporter:
         return name
 
     def _parse_array(self, tensor_proto: onnx.onnx_ml_pb2.TensorProto) -> tvm.nd.array:
-        np_array = get_numpy(tensor_proto).reshape(tuple(tensor_proto.dims))
-        return tvm.nd.array(np_array)
+        # to_array already shapes the result by the tensor's dims, so it is copied only once here.
+        return tvm.nd.array(get_numpy(tensor_proto))
 
     def _parse_attr(self, attr_proto: onnx.onnx_ml_pb2.AttributeProto) -> Dict[str, Any]:
         """Convert a list of AttributeProto to a dict, with names as keys."""
         attrs = {}
+        field_map = _get_attr_field_map()
         for a in attr_proto:
+            if a.type in field_map:
+                # Typed attributes hold their value in exactly one known field.
+                f, is_list = field_map[a.type]
+                if f == "graphs":
+                    raise NotImplementedError("Field {} is not supported in relax.".format(f))
+                value = getattr(a, f)
+                if is_list:
+                    if not value:
+                        raise ValueError("Cannot parse attribute: \n{}\n.".format(a))
+                    value = tuple(value)
+                attrs[a.name] = value
+                continue
+            # Attributes from older exporters may not set their type, so probe every field.
             for f in ["f", "i", "s", "g"]:
                 if a.HasField(f):
                     attrs[a.name] = getattr(a, f)
@@ -2045,10 +2334,12 @@ class ONNXGraphImporter:
         sym : tvm.relax.function.Function
             Converted relax function
         """
-        convert_map = _get_convert_map()
-        if op_name in convert_map:
-            convert_class = convert_map[op_name]
-            op_function = convert_class.get_converter(opset)
+        dispatch_map = _get_dispatch_map(opset)
+        if op_name in dispatch_map:
+            op_function = dispatch_map[op_name]
+            if not self._attach_spans:
+                # Without a current span, attach_span returns each op unchanged.
+                return op_function(self.bb, inputs, attrs)
             span = tvm.ir.Span(tvm.ir.SourceName(op_name), node_index, node_index, 0, 0)
             with relax.frontend.SpanContext(span):
                 sym = op_function(self.bb, inputs, attrs)
@@ -2063,6 +2354,8 @@ def from_onnx(
     dtype_dict: Optional[Union[str, Dict[str, str]]] = "float32",
     opset: int = None,
     sanitize_input_names: bool = True,
+    validate: bool = True,
+    attach_spans: bool = True,
 ) -> Tuple[IRModule, Dict]:
     """Convert a ONNX model into an equivalent Relax Function.
     ONNX graphs are represented as Python Protobuf objects.
@@ -2082,6 +2375,13 @@ def from_onnx(
         This can be helpful for some testing.
     sanitize_input_names : bool, optional
         Whether to sanitize the input names to ensure they are valid Relax identifiers.
+    validate : bool, optional
+        Whether to run onnx.checker.check_model on the model before converting it.
+        Checking a large model can take as long as converting it, so this can be disabled
+        for models that are already known to pass the checker.
+    attach_spans : bool, optional
+        Whether to attach a span naming the source ONNX node to each converted op.
+        Disabling this skips the per-node span bookkeeping when the spans are not needed.
 
     Returns
     -------
@@ -2098,20 +2398,15 @@ def from_onnx(
             )
         )
 
-    try:
-        import onnx  # pylint: disable=import-outside-toplevel, redefined-outer-name
-
-        if hasattr(onnx.checker, "check_model"):
-            # try use onnx's own model checker before converting any model
-            try:
-                onnx.checker.check_model(model)
-            except Exception as exception:  # pylint: disable=c-extension-no-member, broad-except
-                # the checker is a bit violent about errors, so simply print warnings here
-                warnings.warn(str(exception))
-    except ImportError as error:
-        raise ImportError("Unable to import onnx which is required {}".format(error))
-
-    g = ONNXGraphImporter(shape_dict, dtype_dict, sanitize_input_names)
+    if validate and hasattr(onnx.checker, "check_model"):
+        # try use onnx's own model checker before converting any model
+        try:
+            onnx.checker.check_model(model)
+        except Exception as exception:  # pylint: disable=c-extension-no-member, broad-except
+            # the checker is a bit violent about errors, so simply print warnings here
+            warnings.warn(str(exception))
+
+    g = ONNXGraphImporter(shape_dict, dtype_dict, sanitize_input_names, attach_spans)
     graph = model.graph
 
     try:
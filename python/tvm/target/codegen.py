@@ -15,6 +15,8 @@
 # specific language governing permissions and limitations
 # under the License.
 """Code generation related functions."""
+from typing import List
+
 from . import _ffi_api
 from .target import Target
 
@@ -71,6 +73,40 @@ def llvm_get_intrinsic_name(intrin_id: int) -> str:
     return _ffi_api.llvm_get_intrinsic_name(intrin_id)
 
 
+def llvm_get_system_triple() -> str:
+    """Get the default target triple of the host, as seen by the LLVM linked into TVM.
+
+    Returns
+    -------
+    triple : str
+        The host target triple.
+    """
+    return _ffi_api.llvm_get_system_triple()
+
+
+def llvm_get_system_cpu() -> str:
+    """Get the LLVM name of the host cpu.
+
+    Returns
+    -------
+    cpu : str
+        The host cpu name, suitable for use as -mcpu.
+    """
+    return _ffi_api.llvm_get_system_cpu()
+
+
+def llvm_get_system_features() -> List[str]:
+    """Get the LLVM features enabled on the host cpu.
+
+    Returns
+    -------
+    features : List[str]
+        The enabled host cpu features, suitable for use in -mattr.
+        Empty if LLVM cannot detect the features of this host.
+    """
+    return list(_ffi_api.llvm_get_system_features())
+
+
 def llvm_version_major(allow_none=False):
     """Get the major LLVM version.
 
@@ -250,6 +250,38 @@ def prod(data, axis=None, keepdims=False):
     return cpp.prod(data, axis, keepdims)
 
 
+def logsumexp(data, axis=None, keepdims=False):
+    """Log of the sum of exponentials of array elements over a given axis or a list of axes
+
+    The maximum over the reduced axes is subtracted before exponentiation, so the
+    result does not overflow for inputs with large magnitude.
+
+    Parameters
+    ----------
+    data : tvm.te.Tensor
+        The input tvm tensor
+
+    axis : None or int or tuple of int
+        Axis or axes along which the reduction is performed.
+        The default, axis=None, will reduce over all of the elements of the input array.
+        If axis is negative it counts from the last to the first axis.
+
+    keepdims : bool
+        If this is set to True, the axes which are reduced are left in the result as dimensions
+        with size one.
+        With this option, the result will broadcast correctly against the input array.
+
+    Returns
+    -------
+    ret : tvm.te.Tensor
+    """
+    max_data = cpp.max(data, axis, True)
+    sum_exp = cpp.sum(cpp.exp(cpp.subtract(data, max_data)), axis, keepdims)
+    if not keepdims:
+        max_data = cpp.squeeze(max_data, axis)
+    return cpp.add(cpp.log(sum_exp), max_data)
+
+
 def collapse_sum(data, target_shape):
     """Return a summation of data to the given shape.
 
@@ -0,0 +1,270 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+This file tests the host detection helpers used to build octo targets.
+"""
+import builtins
+import io
+import os
+import subprocess
+
+import tvm.testing
+from tvm.octo.utils import target_info
+
+
+LLC_MATTR_HELP = """Available CPU for this target:
+
+  skylake - Select the skylake processor.
+
+Available features for this target:
+
+  avx2   - Enable AVX2 instructions.
+  sse4.2 - Enable SSE 4.2 instructions.
+
+Use +feature to enable a feature, or -feature to disable it.
+"""
+
+
+class FakePopen:
+    """Stand in for subprocess.Popen that streams fixed output."""
+
+    def __init__(self, output):
+        self.stdout = iter(output.splitlines(keepends=True))
+        self.returncode = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def communicate(self):
+        return "", ""
+
+
+def patch_llc(monkeypatch, tmp_path, output, llc_path="/usr/bin/llc"):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setattr(target_info, "_llc_path", lambda: llc_path)
+    monkeypatch.setattr(target_info.subprocess, "Popen", lambda *args, **kwargs: FakePopen(output))
+
+
+def cache_files(tmp_path):
+    cache_dir = tmp_path / "tvm"
+    return sorted(os.listdir(cache_dir)) if cache_dir.exists() else []
+
+
+def test_llvm_attrs_are_cached(monkeypatch, tmp_path):
+    patch_llc(monkeypatch, tmp_path, LLC_MATTR_HELP)
+    attrs = target_info._get_llvm_attrs("x86-64", "LLVM version 15")
+    assert attrs == {"avx2", "sse4.2"}
+    assert len(cache_files(tmp_path)) == 1
+
+    # A cached result is returned without running llc again.
+    monkeypatch.setattr(target_info.subprocess, "Popen", None)
+    assert target_info._get_llvm_attrs("x86-64", "LLVM version 15") == attrs
+
+
+def test_llvm_attrs_cache_key_includes_llc_build(monkeypatch, tmp_path):
+    patch_llc(monkeypatch, tmp_path, LLC_MATTR_HELP)
+    target_info._get_llvm_attrs("x86-64", "LLVM version 15")
+    target_info._get_llvm_attrs("x86-64", "LLVM version 16")
+    patch_llc(monkeypatch, tmp_path, LLC_MATTR_HELP, llc_path="/opt/llvm/bin/llc")
+    target_info._get_llvm_attrs("x86-64", "LLVM version 16")
+    assert len(cache_files(tmp_path)) == 3
+
+
+def test_llvm_attrs_not_cached_when_empty(monkeypatch, tmp_path):
+    # Output cut off before the features table must not poison the cache.
+    patch_llc(monkeypatch, tmp_path, LLC_MATTR_HELP.split("Available features")[0])
+    assert target_info._get_llvm_attrs("x86-64", "LLVM version 15") == frozenset()
+    assert cache_files(tmp_path) == []
+
+
+X86_CPUINFO = """processor\t: 0
+physical id\t: 0
+cpu cores\t: 4
+flags\t\t: fpu sse4_1 sse4_2 pni avx2
+
+processor\t: 1
+physical id\t: 1
+cpu cores\t: 4
+flags\t\t: fpu sse4_1 sse4_2 pni avx2
+"""
+
+AARCH64_CPUINFO = """processor\t: 0
+BogoMIPS\t: 50.00
+Features\t: fp asimd aes crc32
+
+processor\t: 1
+BogoMIPS\t: 50.00
+Features\t: fp asimd aes crc32
+"""
+
+AARCH64_LSCPU = """Architecture:        aarch64
+CPU(s):              2
+Core(s) per socket:  2
+Socket(s):           1
+Flags:               fp asimd aes crc32
+"""
+
+# lscpu on ARM servers reports clusters, and leaves the socket count out or prints "-".
+AARCH64_CLUSTER_LSCPU = """Architecture:        aarch64
+CPU(s):              8
+Vendor ID:           ARM
+Model name:          Neoverse-N1
+Thread(s) per core:  1
+Core(s) per cluster: 8
+Socket(s):           -
+Cluster(s):          1
+Flags:               fp asimd aes crc32
+"""
+
+
+def patch_linux_host(monkeypatch, cpuinfo, machine, lscpu=None):
+    """Make target_info see a linux host with the given /proc/cpuinfo and lscpu output."""
+    monkeypatch.setattr(target_info.sys, "platform", "linux")
+    monkeypatch.setattr(target_info.platform, "machine", lambda: machine)
+
+    def fake_open(path, *args, **kwargs):
+        if path == "/proc/cpuinfo":
+            return io.StringIO(cpuinfo)
+        return builtins.open(path, *args, **kwargs)
+
+    monkeypatch.setattr(target_info, "open", fake_open, raising=False)
+
+    def fake_run(args, **kwargs):
+        assert args == ["lscpu"], "Only lscpu should be run"
+        if lscpu is None:
+            raise FileNotFoundError("lscpu")
+        return subprocess.CompletedProcess(args, 0, stdout=lscpu, stderr="")
+
+    monkeypatch.setattr(target_info.subprocess, "run", fake_run)
+
+
+def test_host_cpu_info_from_proc_cpuinfo(monkeypatch):
+    # Everything is read from /proc/cpuinfo, so lscpu is never needed.
+    patch_linux_host(monkeypatch, X86_CPUINFO, "x86_64")
+    features, march, cores, sockets = target_info._get_host_cpu_info()
+    assert features == ["fpu", "sse4_1", "sse4_2", "pni", "avx2"]
+    assert march == "x86_64"
+    assert cores == 4
+    assert sockets == 2
+
+
+def test_host_cpu_info_falls_back_to_lscpu(monkeypatch):
+    # aarch64 kernels report no physical id or cpu cores, so lscpu fills them in.
+    patch_linux_host(monkeypatch, AARCH64_CPUINFO, "aarch64", lscpu=AARCH64_LSCPU)
+    features, march, cores, sockets = target_info._get_host_cpu_info()
+    assert features == ["fp", "asimd", "aes", "crc32"]
+    assert march == "aarch64"
+    assert cores == 2
+    assert sockets == 1
+
+
+def test_host_cpu_info_from_arm_lscpu(monkeypatch):
+    patch_linux_host(monkeypatch, AARCH64_CPUINFO, "aarch64", lscpu=AARCH64_CLUSTER_LSCPU)
+    features, march, cores, sockets = target_info._get_host_cpu_info()
+    assert features == ["fp", "asimd", "aes", "crc32"]
+    assert march == "aarch64"
+    assert cores == 8
+    assert sockets == 1
+
+
+def test_linux_features_are_renamed(monkeypatch):
+    patch_linux_host(monkeypatch, X86_CPUINFO, "x86_64")
+    llc_version = "  Host CPU: skylake\n\n  Registered Targets:\n    x86-64 - 64-bit X86\n"
+    monkeypatch.setattr(
+        target_info.subprocess,
+        "run",
+        lambda args, **kwargs: subprocess.CompletedProcess(args, 0, stdout=llc_version),
+    )
+    monkeypatch.setattr(target_info, "_host_triple", lambda: "x86_64-pc-linux-gnu")
+    monkeypatch.setattr(target_info, "_get_num_cores", lambda cores, sockets: cores)
+    # "fpu" has no llvm attribute, and the others only match after renaming.
+    monkeypatch.setattr(
+        target_info,
+        "_get_llvm_attrs",
+        lambda march, llc_info: frozenset(["sse4.1", "sse4.2", "sse3", "ssse3", "avx2"]),
+    )
+    target = target_info._extract_llvm_target()
+    assert list(target.mattr) == ["+sse4.1", "+sse4.2", "+sse3", "+avx2"]
+    assert target.mcpu == "skylake"
+
+
+def test_in_process_target_counts_physical_cores(monkeypatch):
+    # Two sockets of 4 physical cores each, matching what the llc path reports.
+    patch_linux_host(monkeypatch, X86_CPUINFO, "x86_64")
+    monkeypatch.setattr(target_info, "_get_num_cores", lambda cores, sockets: cores * sockets)
+    codegen = tvm.target.codegen
+    monkeypatch.setattr(codegen, "llvm_get_system_cpu", lambda: "skylake")
+    monkeypatch.setattr(codegen, "llvm_get_system_triple", lambda: "x86_64-pc-linux-gnu")
+    monkeypatch.setattr(codegen, "llvm_get_system_features", lambda: ["avx2", "sse4.2"])
+    target = target_info._extract_llvm_target_in_process()
+    assert int(target.attrs["num-cores"]) == 8
+    assert list(target.mattr) == ["+avx2", "+sse4.2"]
+    assert target.mcpu == "skylake"
+
+
+def test_env_target_is_read_on_every_call(monkeypatch):
+    monkeypatch.delenv("TVM_LLVM_TARGET", raising=False)
+    monkeypatch.delenv("TVM_TARGET", raising=False)
+    monkeypatch.setattr(target_info, "_detect_llvm_target", lambda: "detected")
+    assert target_info.get_llvm_target() == "detected"
+    # Setting the variable after a first call must still override host detection.
+    monkeypatch.setenv("TVM_LLVM_TARGET", "llvm -mcpu=skylake")
+    assert target_info.get_llvm_target().mcpu == "skylake"
+
+
+def make_numa_nodes(monkeypatch, tmp_path, cpulists):
+    """Point target_info at a fake sysfs node tree with one node per cpulist."""
+    for i, cpulist in enumerate(cpulists):
+        node_dir = tmp_path / f"node{i}"
+        node_dir.mkdir()
+        (node_dir / "cpulist").write_text(cpulist)
+    # Entries that are not nodes must be ignored.
+    (tmp_path / "possible").write_text("0-1")
+    monkeypatch.setattr(target_info, "_SYSFS_NODE_DIR", str(tmp_path))
+
+
+def patch_affinity(monkeypatch, num_cpus):
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(num_cpus)), raising=False)
+
+
+def test_num_cores_per_numa_node(monkeypatch, tmp_path):
+    # Two sockets of 8 cores split into four NUMA nodes, plus a memory only node.
+    make_numa_nodes(monkeypatch, tmp_path, ["0-3", "4-7", "8-11", "12-15", "\n"])
+    patch_affinity(monkeypatch, 64)
+    assert target_info._get_num_cores(8, 2) == 4
+
+
+def test_num_cores_bounded_by_affinity(monkeypatch, tmp_path):
+    make_numa_nodes(monkeypatch, tmp_path, ["0-15"])
+    patch_affinity(monkeypatch, 2)
+    assert target_info._get_num_cores(16, 1) == 2
+
+
+def test_num_cores_without_numa_nodes(monkeypatch, tmp_path):
+    # Without any node directories, cores are counted per socket.
+    make_numa_nodes(monkeypatch, tmp_path, [])
+    patch_affinity(monkeypatch, 64)
+    assert target_info._get_num_cores(8, 2) == 8
+    monkeypatch.setattr(target_info, "_SYSFS_NODE_DIR", str(tmp_path / "missing"))
+    assert target_info._get_num_cores(8, 2) == 8
+
+
+if __name__ == "__main__":
+    tvm.testing.main()
@@ -182,6 +182,88 @@ def test_span_is_added():
     assert bindings[-1].value.span.source_name.name == "Div"
 
 
+def test_duplicate_nodes_are_reused():
+    # Both Add nodes compute the same value, so only one add should be emitted.
+    add_nodes = [
+        helper.make_node("Add", ["x", "y"], ["a"]),
+        helper.make_node("Add", ["x", "y"], ["b"]),
+    ]
+    mul_node = helper.make_node("Mul", ["a", "b"], ["z"])
+
+    graph = helper.make_graph(
+        add_nodes + [mul_node],
+        "duplicate_nodes",
+        inputs=[
+            helper.make_tensor_value_info("x", TensorProto.FLOAT, [32, 32]),
+            helper.make_tensor_value_info("y", TensorProto.FLOAT, [32, 32]),
+        ],
+        outputs=[helper.make_tensor_value_info("z", TensorProto.FLOAT, [32, 32])],
+    )
+
+    model = helper.make_model(graph, producer_name="duplicate_nodes_test")
+    check_correctness(model)
+
+    tvm_model = from_onnx_wrapper(model)
+    bindings = tvm_model["main"].body.blocks[0].bindings
+    add_op = tvm.ir.Op.get("relax.add")
+    assert sum(isinstance(b.value, relax.Call) and b.value.op == add_op for b in bindings) == 1
+
+
+def test_duplicate_nodes_with_tensor_attrs_are_reused():
+    # Both Constant nodes hold the same tensor attribute, so both adds compute the same value.
+    const_nodes = [
+        helper.make_node(
+            "Constant",
+            [],
+            [name],
+            value=helper.make_tensor("value", TensorProto.FLOAT, [32], list(range(32))),
+        )
+        for name in ["c0", "c1"]
+    ]
+    add_nodes = [
+        helper.make_node("Add", ["x", "c0"], ["a"]),
+        helper.make_node("Add", ["x", "c1"], ["b"]),
+    ]
+    mul_node = helper.make_node("Mul", ["a", "b"], ["z"])
+
+    graph = helper.make_graph(
+        const_nodes + add_nodes + [mul_node],
+        "duplicate_tensor_attrs",
+        inputs=[helper.make_tensor_value_info("x", TensorProto.FLOAT, [32, 32])],
+        outputs=[helper.make_tensor_value_info("z", TensorProto.FLOAT, [32, 32])],
+    )
+
+    model = helper.make_model(graph, producer_name="duplicate_tensor_attrs_test")
+    check_correctness(model)
+
+    tvm_model = from_onnx_wrapper(model)
+    bindings = tvm_model["main"].body.blocks[0].bindings
+    add_op = tvm.ir.Op.get("relax.add")
+    assert sum(isinstance(b.value, relax.Call) and b.value.op == add_op for b in bindings) == 1
+
+
+def test_span_is_not_added():
+    add_node = helper.make_node("Add", inputs=["input_1", "input_2"], outputs=["output"])
+
+    graph = helper.make_graph(
+        [add_node],
+        "test",
+        inputs=[
+            helper.make_tensor_value_info("input_1", TensorProto.FLOAT, [32, 32]),
+            helper.make_tensor_value_info("input_2", TensorProto.FLOAT, [32, 32]),
+        ],
+        outputs=[
+            helper.make_tensor_value_info("output", TensorProto.FLOAT, [32, 32]),
+        ],
+    )
+
+    model = helper.make_model(graph, producer_name="test_span")
+    tvm_model = from_onnx(model, attach_spans=False)
+
+    bindings = tvm_model["main"].body.blocks[0].bindings
+    assert bindings[-1].value.span is None
+
+
 @pytest.mark.parametrize(
     "input_names, expected_names",
     [
@@ -211,6 +293,86 @@ def test_sanitize(input_names, expected_names):
         assert param.name_hint == expected_names[i]
 
 
+def test_converter_version_selection():
+    from tvm.relax.frontend.onnx.onnx_frontend import ArgMax
+
+    # The newest implementation not greater than the opset is selected.
+    assert ArgMax.get_converter(1) == ArgMax._impl_v1
+    assert ArgMax.get_converter(11) == ArgMax._impl_v11
+    assert ArgMax.get_converter(18) == ArgMax._impl_v12
+    # Selection is cached per converter and opset.
+    assert ArgMax.get_converter(18) is ArgMax.get_converter(18)
+
+
+def test_onnx_input_indexing():
+    from tvm.relax.frontend.onnx.onnx_frontend import onnx_input
+
+    inputs = onnx_input(["a", "b"])
+    assert inputs[1] == "b"
+    assert inputs[-1] == "b"
+    assert inputs[2] is None
+    assert inputs[:2] == ["a", "b"]
+    assert inputs[1:] == ["b"]
+    # Slices reading past the end are padded with None.
+    assert inputs[:4] == ["a", "b", None, None]
+
+
+def test_const_values_memo_is_per_graph():
+    from tvm.relax.frontend.onnx.onnx_frontend import ONNXGraphImporter, _const_values
+
+    # Scalar constants decode to a single element tuple.
+    assert _const_values(relax.const(3, "int64")) == (3,)
+    assert _const_values(relax.const([1, 2], "int64")) == (1, 2)
+
+    add_node = helper.make_node("Add", ["x", "y"], ["z"])
+    graph = helper.make_graph(
+        [add_node],
+        "const_values_memo",
+        inputs=[helper.make_tensor_value_info("x", TensorProto.FLOAT, [4])],
+        initializer=[helper.make_tensor("y", TensorProto.FLOAT, [4], [1, 2, 3, 4])],
+        outputs=[helper.make_tensor_value_info("z", TensorProto.FLOAT, [4])],
+    )
+    importer = ONNXGraphImporter({}, "float32")
+    importer.from_onnx(graph, opset=13)
+    # Nothing memoized during the import outlives it.
+    assert ONNXGraphImporter.current is None
+    assert not importer.memo
+
+
+def test_scalar_const_keeps_zero_sign():
+    from tvm.relax.frontend.onnx.onnx_frontend import ONNXGraphImporter, _scalar_const
+
+    # Scalar constants are only reused while a graph is being imported.
+    importer = ONNXGraphImporter({}, "float32")
+    previous, ONNXGraphImporter.current = ONNXGraphImporter.current, importer
+    try:
+        positive = _scalar_const(0.0, "float32")
+        negative = _scalar_const(-0.0, "float32")
+        assert not positive.same_as(negative)
+        assert np.signbit(negative.data.numpy())
+        assert not np.signbit(_scalar_const(0.0, "float32").data.numpy())
+        assert _scalar_const(0.0, "float32").same_as(positive)
+    finally:
+        ONNXGraphImporter.current = previous
+    assert not _scalar_const(0.0, "float32").same_as(positive)
+
+
+def test_get_info_shares_symbolic_dims():
+    from tvm.relax.frontend.onnx.onnx_frontend import get_info
+
+    a = helper.make_tensor_value_info("a", TensorProto.FLOAT, ["batch", 16, None])
+    b = helper.make_tensor_value_info("b", TensorProto.FLOAT, ["batch", None])
+
+    dim_vars = {}
+    _, a_shape, dtype, a_shape_name = get_info(a, dim_vars)
+    _, b_shape, _, _ = get_info(b, dim_vars)
+    assert dtype == "float32"
+    assert a_shape_name == ["batch", 16, ""]
+    # Dimensions with the same name share a variable, unnamed ones do not.
+    assert a_shape[0].same_as(b_shape[0])
+    assert not a_shape[2].same_as(b_shape[1])
+
+
 def verify_unary(op_name, shape, attrs={}, domain=None):
     test_node = helper.make_node(op_name, ["x"], ["y"], **attrs, domain=domain)
     graph = helper.make_graph(
@@ -399,6 +561,30 @@ def test_gemm(alpha, beta, useC):
     check_correctness(model)
 
 
+def test_gemm_constant_operands():
+    gemm_node = helper.make_node(
+        "Gemm", ["a", "b", "c"], ["y"], alpha=0.25, beta=0.35, transA=1, transB=1
+    )
+
+    graph = helper.make_graph(
+        [gemm_node],
+        "gemm_test",
+        inputs=[helper.make_tensor_value_info("b", TensorProto.FLOAT, [5, 4])],
+        initializer=[
+            helper.make_tensor(
+                "a", TensorProto.FLOAT, [4, 3], np.random.randn(4, 3).astype("float32").flatten()
+            ),
+            helper.make_tensor(
+                "c", TensorProto.FLOAT, [1, 5], np.random.randn(1, 5).astype("float32").flatten()
+            ),
+        ],
+        outputs=[helper.make_tensor_value_info("y", TensorProto.FLOAT, [3, 5])],
+    )
+
+    model = helper.make_model(graph, producer_name="gemm_test")
+    check_correctness(model)
+
+
 @pytest.mark.parametrize(
     "in_shape, shape, out_shape",
     [
@@ -457,6 +643,31 @@ def test_unsqueeze():
     check_correctness(model)
 
 
+def test_unsqueeze_constant():
+    # Unsqueeze a constant so it is folded at import time, then add it to an input.
+    unsqueeze_node = helper.make_node("Unsqueeze", ["a", "axes"], ["b"])
+    add_node = helper.make_node("Add", ["b", "x"], ["y"])
+
+    graph = helper.make_graph(
+        [unsqueeze_node, add_node],
+        "unsqueeze_constant",
+        inputs=[helper.make_tensor_value_info("x", TensorProto.FLOAT, [1, 32, 1, 1, 32])],
+        initializer=[
+            helper.make_tensor(
+                "a",
+                TensorProto.FLOAT,
+                [32, 32],
+                np.random.randn(32, 32).astype("float32").flatten(),
+            ),
+            helper.make_tensor("axes", TensorProto.INT64, [3], vals=[-2, 0, 2]),
+        ],
+        outputs=[helper.make_tensor_value_info("y", TensorProto.FLOAT, [1, 32, 1, 1, 32])],
+    )
+
+    model = helper.make_model(graph, producer_name="unsqueeze_test")
+    check_correctness(model)
+
+
 def test_gelu():
     verify_unary("Gelu", [32, 32], domain="com.microsoft")
 
@@ -512,6 +723,24 @@ def test_clip(min, max):
     check_correctness(model)
 
 
+def test_clip_infinite_bounds():
+    clip_node = helper.make_node("Clip", ["input", "min", "max"], ["output"])
+
+    graph = helper.make_graph(
+        [clip_node],
+        "clip_test",
+        inputs=[helper.make_tensor_value_info("input", TensorProto.FLOAT, [32, 64])],
+        initializer=[
+            helper.make_tensor("min", TensorProto.FLOAT, (), [-np.inf]),
+            helper.make_tensor("max", TensorProto.FLOAT, (), [0.5]),
+        ],
+        outputs=[helper.make_tensor_value_info("output", TensorProto.FLOAT, [32, 64])],
+    )
+
+    model = helper.make_model(graph, producer_name="clip_test")
+    check_correctness(model)
+
+
 def test_equal():
     equal_node = helper.make_node("Equal", ["a", "b"], ["output"])
 
@@ -689,6 +918,24 @@ def test_max():
     verify_binary("Max", [32, 16], [32, 16], [32, 16])
 
 
+@pytest.mark.parametrize("op_name", ["Min", "Max"])
+def test_min_max_variadic(op_name):
+    test_node = helper.make_node(op_name, ["a", "b", "c"], ["d"])
+    graph = helper.make_graph(
+        [test_node],
+        "variadic_test",
+        inputs=[
+            helper.make_tensor_value_info("a", TensorProto.FLOAT, [32, 16]),
+            helper.make_tensor_value_info("b", TensorProto.FLOAT, [32, 16]),
+            helper.make_tensor_value_info("c", TensorProto.FLOAT, [1, 16]),
+        ],
+        outputs=[helper.make_tensor_value_info("d", TensorProto.FLOAT, [32, 16])],
+    )
+
+    model = helper.make_model(graph, producer_name="variadic_test")
+    check_correctness(model)
+
+
 def test_sin():
     verify_unary("Sin", [32, 16])
 
@@ -726,6 +973,42 @@ def test_instance_norm():
     )
 
 
+def test_instance_norm_float64():
+    # float64 inputs cannot use group_norm, so they go through the mean and variance path.
+    # onnxruntime has no float64 kernel for this op, so compare against numpy instead.
+    instance_norm_node = helper.make_node(
+        "InstanceNormalization", ["a", "b", "c"], ["d"], epsilon=1e-5
+    )
+    graph = helper.make_graph(
+        [instance_norm_node],
+        "instance_norm_float64_test",
+        inputs=[
+            helper.make_tensor_value_info("a", TensorProto.DOUBLE, [1, 3, 32, 32]),
+            helper.make_tensor_value_info("b", TensorProto.DOUBLE, [3]),
+            helper.make_tensor_value_info("c", TensorProto.DOUBLE, [3]),
+        ],
+        outputs=[helper.make_tensor_value_info("d", TensorProto.DOUBLE, [1, 3, 32, 32])],
+    )
+    model = helper.make_model(graph, producer_name="instance_norm_float64_test")
+    inputs = generate_random_inputs(model)
+
+    tvm_model = relax.transform.LegalizeOps()(from_onnx_wrapper(model))
+    with tvm.transform.PassContext(opt_level=3):
+        ex = relax.build(tvm_model, target="llvm")
+        vm = relax.VirtualMachine(ex, tvm.cpu())
+    vm.set_input("main", **inputs)
+    vm.invoke_stateful("main")
+    tvm_output = vm.get_outputs("main")
+
+    data, scale, bias = inputs["a"], inputs["b"], inputs["c"]
+    mean = data.mean(axis=(2, 3), keepdims=True)
+    var = data.var(axis=(2, 3), keepdims=True)
+    expected = (data - mean) / np.sqrt(var + 1e-5) * scale.reshape(-1, 1, 1) + bias.reshape(
+        -1, 1, 1
+    )
+    tvm.testing.assert_allclose(tvm_output.numpy(), expected, atol=1e-5)
+
+
 def test_layer_norm():
     layer_norm_node = helper.make_node("LayerNormalization", ["a", "b", "c"], ["d"], epsilon=1e-12)
 
@@ -1083,6 +1366,17 @@ def test_expand(dynamic):
     ref_data = np.tile(data, 4)
     _test_expand("expand_with_dim_unchanged_test", data, shape, ref_data)
 
+    in_shape = (3, 1)
+    shape = (2, 1, 4)
+    data = np.random.uniform(size=in_shape).astype(np.float32)
+    ref_data = data * np.ones(shape, dtype=np.float32)
+    _test_expand("expand_larger_target_shape_test", data, shape, ref_data)
+
+    in_shape = (3, 4)
+    shape = (3, 4)
+    data = np.random.uniform(size=in_shape).astype(np.float32)
+    _test_expand("expand_to_same_shape_test", data, shape, data)
+
 
 # TODO(jwfromm) Current approach to dynamic expand is technically not well formed. Reenable once fixed.
 @pytest.mark.skip("Produces ill-formed IR")
@@ -1125,6 +1419,8 @@ def test_constantofshape():
     verify_constantofshape((2, 3, 4, 5), 10, "float32")
     verify_constantofshape((3, 3), 0, "int32")
     verify_constantofshape((1, 2, 3), -1, "float32")
+    # Large outputs are filled at runtime rather than folded into a constant.
+    verify_constantofshape((1, 1024, 1025), 2, "float32")
 
 
 def test_slice():
@@ -1541,6 +1837,31 @@ def test_range():
     check_correctness(model)
 
 
+def test_range_float():
+    range_node = helper.make_node(
+        "Range",
+        ["start", "limit", "delta"],
+        ["output"],
+    )
+
+    graph = helper.make_graph(
+        [range_node],
+        "range_test",
+        inputs=[],
+        initializer=[
+            helper.make_tensor("start", TensorProto.FLOAT, [], [0.5]),
+            helper.make_tensor("limit", TensorProto.FLOAT, [], [3.0]),
+            helper.make_tensor("delta", TensorProto.FLOAT, [], [0.25]),
+        ],
+        outputs=[
+            helper.make_tensor_value_info("output", TensorProto.FLOAT, [10]),
+        ],
+    )
+
+    model = helper.make_model(graph, producer_name="range_test")
+    check_correctness(model)
+
+
 def test_less():
     verify_compare("Less", [32, 32])
 
@@ -1663,9 +1984,81 @@ def test_onehot():
     check_correctness(model, inputs=values)
 
 
+@pytest.mark.parametrize("axis", [1, -1])
+def test_onehot_constant(axis):
+    # One-hot encode constant indices so they are folded at import time, then add to an input.
+    one_hot_node = helper.make_node("OneHot", ["indices", "depth", "values"], ["b"], axis=axis)
+    add_node = helper.make_node("Add", ["b", "x"], ["y"])
+    out_shape = [2, 10, 2] if axis == 1 else [2, 2, 10]
+    graph = helper.make_graph(
+        [one_hot_node, add_node],
+        "one_hot_constant_test",
+        inputs=[helper.make_tensor_value_info("x", TensorProto.FLOAT, out_shape)],
+        initializer=[
+            helper.make_tensor("indices", TensorProto.INT64, [2, 2], [1, -1, 2, 4]),
+            helper.make_tensor("depth", TensorProto.INT64, [], [10]),
+            helper.make_tensor("values", TensorProto.FLOAT, [2], [3, 1]),
+        ],
+        outputs=[helper.make_tensor_value_info("y", TensorProto.FLOAT, out_shape)],
+    )
+
+    model = helper.make_model(graph, producer_name="one_hot_constant_test")
+    check_correctness(model)
+
+
 def test_reciprocal():
     verify_unary("Reciprocal", [3, 32, 32])
 
 
+@pytest.mark.parametrize("op_name", ["Sqrt", "Reciprocal"])
+def test_unary_constant(op_name):
+    # Apply the op to a constant so it is folded at import time, then add it to an input.
+    unary_node = helper.make_node(op_name, ["a"], ["b"])
+    add_node = helper.make_node("Add", ["b", "x"], ["y"])
+
+    graph = helper.make_graph(
+        [unary_node, add_node],
+        "unary_constant",
+        inputs=[helper.make_tensor_value_info("x", TensorProto.FLOAT, [32, 32])],
+        initializer=[
+            helper.make_tensor(
+                "a",
+                TensorProto.FLOAT,
+                [32, 32],
+                np.random.uniform(0.5, 2.0, (32, 32)).astype("float32").flatten(),
+            ),
+        ],
+        outputs=[helper.make_tensor_value_info("y", TensorProto.FLOAT, [32, 32])],
+    )
+
+    model = helper.make_model(graph, producer_name="unary_constant_test")
+    check_correctness(model)
+
+
+def test_duplicate_initializers():
+    # Initializers "a" and "b" hold the same bytes and are shared, "c" only matches their shape.
+    shared = np.random.randn(32, 32).astype("float32")
+    initializers = [
+        helper.make_tensor(name, TensorProto.FLOAT, [32, 32], value.tobytes(), raw=True)
+        for name, value in [("a", shared), ("b", shared.copy()), ("c", shared + 1)]
+    ]
+    add_nodes = [
+        helper.make_node("Add", ["x", "a"], ["xa"]),
+        helper.make_node("Add", ["xa", "b"], ["xab"]),
+        helper.make_node("Add", ["xab", "c"], ["y"]),
+    ]
+
+    graph = helper.make_graph(
+        add_nodes,
+        "duplicate_initializers",
+        inputs=[helper.make_tensor_value_info("x", TensorProto.FLOAT, [32, 32])],
+        initializer=initializers,
+        outputs=[helper.make_tensor_value_info("y", TensorProto.FLOAT, [32, 32])],
+    )
+
+    model = helper.make_model(graph, producer_name="duplicate_initializers_test")
+    check_correctness(model)
+
+
 if __name__ == "__main__":
     tvm.testing.main()
@@ -230,5 +230,28 @@ def test_collapse_sum(data_shape, target_shape):
     tvm.testing.assert_allclose(b.numpy(), b_np, rtol=1e-5)
 
 
+@pytest.mark.parametrize(
+    "shape, axis, keepdims",
+    [((4, 5, 6), None, False), ((4, 5, 6), (1, 2), True), ((4, 5, 6), -1, False)],
+)
+def test_logsumexp(shape, axis, keepdims):
+    A = te.placeholder(shape, name="A")
+    B = topi.logsumexp(A, axis, keepdims)
+    s = te.create_schedule([B.op])
+
+    # Large magnitudes would overflow a naive exp-then-sum implementation.
+    a_np = np.random.uniform(-100, 100, size=shape).astype(A.dtype)
+    max_np = np.max(a_np, axis=axis, keepdims=True)
+    b_np = np.log(np.sum(np.exp(a_np - max_np), axis=axis, keepdims=True)) + max_np
+    if not keepdims:
+        b_np = np.squeeze(b_np, axis=axis)
+    dev = tvm.cpu(0)
+    a = tvm.nd.array(a_np, dev)
+    b = tvm.nd.array(np.zeros(get_const_tuple(B.shape), dtype=B.dtype), dev)
+    foo = tvm.build(s, [A, B], "llvm", name="logsumexp")
+    foo(a, b)
+    tvm.testing.assert_allclose(b.numpy(), b_np, rtol=1e-5)
+
+
 if __name__ == "__main__":
     tvm.testing.main()
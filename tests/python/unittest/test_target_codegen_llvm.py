@@ -65,6 +65,21 @@ def test_llvm_intrinsic_id():
     assert orig_name == name
 
 
+@tvm.testing.requires_llvm
+def test_llvm_system_info():
+    cpu = tvm.target.codegen.llvm_get_system_cpu()
+    triple = tvm.target.codegen.llvm_get_system_triple()
+    features = tvm.target.codegen.llvm_get_system_features()
+    assert cpu and triple
+    assert all(isinstance(f, str) for f in features)
+    # The reported host information must form a valid target.
+    target_str = f"llvm -mcpu={cpu} -mtriple={triple}"
+    if features:
+        target_str += " -mattr=" + ",".join(f"+{f}" for f in features)
+    target = tvm.target.Target(target_str)
+    assert target.attrs["mcpu"] == cpu
+
+
 @tvm.testing.requires_llvm
 def test_llvm_overloaded_intrin():
     # Name lookup for overloaded intrinsics in LLVM 4- requires a name